@@ -3,6 +3,7 @@ from . import exceptions
 from . import session
 from . import common
 from . import models
+from . import cache
 
 from .server import api
 from . import middleware
@@ -0,0 +1,8 @@
+
+from . import local
+from . import credentials
+from . import users
+from . import responses
+from . import rankings
+from . import cards
+from . import reference
@@ -0,0 +1,185 @@
+
+from app.common.database.objects import DBUser
+from app.models import UserModelCompact, StatsModel
+from app.common.database import users
+from sqlalchemy.orm import Session
+from typing import Iterable, List
+from datetime import datetime
+
+from .local import LocalCache
+
+import app.session
+import orjson
+
+# Cards are stored as positional arrays, the stats separately. Both are
+# kept briefly, since other services update `latest_activity`, the
+# restriction & activation status and the stats without invalidating them
+CARD_TTL = 30
+STATS_TTL = 60
+LOCAL_TTL = 10
+
+CARD_FIELDS = tuple(UserModelCompact.model_fields)
+STATS_FIELDS = tuple(StatsModel.model_fields)
+
+DATETIME_FIELDS = {
+    index
+    for index, field in enumerate(CARD_FIELDS)
+    if UserModelCompact.model_fields[field].annotation is datetime
+}
+
+cache = LocalCache(maxsize=16384, ttl=LOCAL_TTL)
+
+class StatsCard:
+    __slots__ = STATS_FIELDS
+
+    def __init__(self, values: Iterable) -> None:
+        for field, value in zip(STATS_FIELDS, values):
+            setattr(self, field, value)
+
+class UserCard:
+    """Compact user, that can be validated as `UserModelCompact` or `UserModelWithStats`"""
+    __slots__ = CARD_FIELDS + ('stats',)
+
+    def __init__(self, values: Iterable, stats: List[StatsCard] | None = None) -> None:
+        for field, value in zip(CARD_FIELDS, values):
+            setattr(self, field, value)
+
+        self.stats = stats
+
+def card_key(user_id: int) -> str:
+    return f'cards:user:{user_id}'
+
+def stats_key(user_id: int) -> str:
+    return f'cards:stats:{user_id}'
+
+def serialize_card(card: UserCard) -> bytes:
+    return orjson.dumps([getattr(card, field) for field in CARD_FIELDS])
+
+def deserialize_card(data: bytes) -> UserCard:
+    return UserCard(
+        datetime.fromisoformat(value)
+        if index in DATETIME_FIELDS and value is not None
+        else value
+        for index, value in enumerate(orjson.loads(data))
+    )
+
+def serialize_stats(stats: List[StatsCard]) -> bytes:
+    return orjson.dumps([
+        [getattr(entry, field) for field in STATS_FIELDS]
+        for entry in stats
+    ])
+
+def deserialize_stats(data: bytes) -> List[StatsCard]:
+    return [StatsCard(values) for values in orjson.loads(data)]
+
+def from_user(user: DBUser, with_stats: bool) -> UserCard:
+    stats = (
+        [
+            StatsCard(getattr(entry, field) for field in STATS_FIELDS)
+            for entry in user.stats
+        ]
+        if with_stats else None
+    )
+
+    return UserCard(
+        (getattr(user, field) for field in CARD_FIELDS),
+        stats
+    )
+
+def fetch_many(
+    user_ids: Iterable[int],
+    session: Session,
+    stats: bool = False,
+    fresh: bool = False
+) -> List[UserCard]:
+    """Resolve the cards of multiple users, only loading those from the database that aren't cached.
+    With `fresh`, every card is loaded from the database & the cache gets refreshed with them."""
+    user_ids = list(dict.fromkeys(user_ids))
+    cards = {}
+    stats_by_id = {}
+
+    for user_id in user_ids:
+        if fresh:
+            break
+
+        if (card := cache.get(('card', user_id))) is not None:
+            cards[user_id] = card
+
+        if stats and (entries := cache.get(('stats', user_id))) is not None:
+            stats_by_id[user_id] = entries
+
+    missing = [
+        user_id for user_id in user_ids
+        if user_id not in cards or (stats and user_id not in stats_by_id)
+    ]
+
+    if missing and not fresh:
+        keys = [card_key(user_id) for user_id in missing]
+
+        if stats:
+            keys.extend(stats_key(user_id) for user_id in missing)
+
+        payloads = app.session.redis.mget(keys)
+
+        for index, user_id in enumerate(missing):
+            if user_id not in cards and (payload := payloads[index]):
+                cards[user_id] = deserialize_card(payload)
+                cache.set(('card', user_id), cards[user_id])
+
+            if stats and user_id not in stats_by_id and (payload := payloads[len(missing) + index]):
+                stats_by_id[user_id] = deserialize_stats(payload)
+                cache.set(('stats', user_id), stats_by_id[user_id])
+
+        missing = [
+            user_id for user_id in missing
+            if user_id not in cards or (stats and user_id not in stats_by_id)
+        ]
+
+    if missing:
+        loaded = (
+            users.fetch_many(missing, DBUser.stats, session=session)
+            if stats else users.fetch_many(missing, session=session)
+        )
+        store([from_user(user, stats) for user in loaded], cards, stats_by_id)
+
+    result = []
+
+    for user_id in user_ids:
+        if (card := cards.get(user_id)) is None:
+            continue
+
+        if stats:
+            # Cards are shared between requests, so attach the stats to a copy
+            card = UserCard((getattr(card, field) for field in CARD_FIELDS), stats_by_id[user_id])
+
+        result.append(card)
+
+    return result
+
+def fetch_one(user_id: int, session: Session, stats: bool = False) -> UserCard | None:
+    return next(iter(fetch_many((user_id,), session, stats)), None)
+
+def store(loaded: List[UserCard], cards: dict, stats_by_id: dict) -> None:
+    with app.session.redis.pipeline(transaction=False) as pipe:
+        for card in loaded:
+            if card.stats is not None:
+                stats_by_id[card.id] = card.stats
+                cache.set(('stats', card.id), card.stats)
+                pipe.set(stats_key(card.id), serialize_stats(card.stats), ex=STATS_TTL)
+
+            card = UserCard((getattr(card, field) for field in CARD_FIELDS))
+            cards[card.id] = card
+            cache.set(('card', card.id), card)
+            pipe.set(card_key(card.id), serialize_card(card), ex=CARD_TTL)
+
+        pipe.execute()
+
+def invalidate(user_id: int) -> None:
+    """Remove the cached card & stats of a user, e.g. after a profile, name or country change"""
+    cache.pop(('card', user_id))
+    cache.pop(('stats', user_id))
+    app.session.redis.delete(card_key(user_id), stats_key(user_id))
+
+def invalidate_stats(user_id: int) -> None:
+    cache.pop(('stats', user_id))
+    app.session.redis.delete(stats_key(user_id))
@@ -0,0 +1,65 @@
+
+from redis.asyncio import Redis as RedisAsync
+from .local import LocalCache
+
+import app.session
+import hashlib
+import hmac
+
+# Successful basic authentications are remembered for a short time,
+# so that clients sending credentials on every request skip bcrypt
+LOCAL_TTL = 10
+
+cache = LocalCache(maxsize=4096, ttl=LOCAL_TTL)
+
+def credentials_key(digest: str) -> str:
+    return f'authentication:basic:{digest}'
+
+def user_credentials_key(user_id: int) -> str:
+    return f'authentication:basic:user:{user_id}'
+
+def credentials_digest(username: str, password: str) -> str:
+    # Keyed hash, so that the cache never contains anything derived from the password alone
+    return hmac.new(
+        app.session.config.FRONTEND_SECRET_KEY.encode(),
+        f'{username}:{password}'.encode(),
+        hashlib.sha256
+    ).hexdigest()
+
+async def fetch(username: str, password: str, redis: RedisAsync) -> int | None:
+    digest = credentials_digest(username, password)
+
+    if (user_id := cache.get(digest)) is not None:
+        return user_id
+
+    if not (user_id := await redis.get(credentials_key(digest))):
+        return None
+
+    cache.set(digest, int(user_id))
+    return int(user_id)
+
+async def store(username: str, password: str, user_id: int, redis: RedisAsync) -> None:
+    digest = credentials_digest(username, password)
+    ttl = app.session.config.API_BASIC_AUTH_CACHE_TTL
+    cache.set(digest, user_id, ttl=min(ttl, LOCAL_TTL))
+
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.set(credentials_key(digest), user_id, ex=ttl)
+        pipe.sadd(user_credentials_key(user_id), digest)
+        pipe.expire(user_credentials_key(user_id), ttl)
+        await pipe.execute()
+
+def invalidate(user_id: int) -> None:
+    """Remove all verified credentials of a user, e.g. after a password change or restriction"""
+    digests = [
+        digest.decode() if isinstance(digest, bytes) else digest
+        for digest in app.session.redis.smembers(user_credentials_key(user_id))
+    ]
+
+    for digest in digests:
+        cache.pop(digest)
+
+    app.session.redis.delete(
+        user_credentials_key(user_id),
+        *(credentials_key(digest) for digest in digests)
+    )
@@ -0,0 +1,51 @@
+
+from typing import Any, Hashable, Tuple
+from collections import OrderedDict
+from threading import Lock
+
+import time
+
+class LocalCache:
+    """Size-bounded in-process cache, where every entry expires after a fixed ttl"""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.entries: OrderedDict[Hashable, Tuple[float, Any]] = OrderedDict()
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self.lock:
+            if (entry := self.entries.get(key)) is None:
+                return default
+
+            expires_at, value = entry
+
+            if time.monotonic() > expires_at:
+                del self.entries[key]
+                return default
+
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        expires_at = time.monotonic() + (ttl if ttl is not None else self.ttl)
+
+        with self.lock:
+            self.entries[key] = (expires_at, value)
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> Any:
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            return entry[1] if entry else None
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
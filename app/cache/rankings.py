@@ -0,0 +1,114 @@
+
+from typing import Callable, Iterable, Tuple
+from redis import Redis
+
+import app.session
+import hashlib
+
+# Ranking pages are served from pre-rendered snapshots, as long as the
+# players & scores on the page are unchanged and the snapshot is younger
+# than `API_RANKING_SNAPSHOT_MAX_AGE`. Other values, e.g. the ranks in
+# other orders, are only refreshed once the snapshot expires.
+#
+# Snapshots are rendered from fresh cards & stats, and the response cache
+# serves them for up to `RESPONSE_TTL` seconds on top. That time is taken
+# off the snapshot's lifetime, so that no page is served older than the max.
+# age, as long as the max. age is larger than `RESPONSE_TTL`.
+
+RESPONSE_TTL = 30
+
+def snapshot_key(board: str, offset: int, limit: int) -> str:
+    return f'rankings:snapshot:{board}:{offset}:{limit}'
+
+def user_key(user_id: int) -> str:
+    return f'rankings:snapshot:user:{user_id}'
+
+def board_name(order: str, mode: int | None = None, country: str | None = None) -> str:
+    return ':'.join(str(part) for part in (order, mode, country) if part is not None)
+
+def page_signature(players: Iterable[Tuple[int, float]]) -> bytes:
+    page = ','.join(f'{user_id}:{score}' for user_id, score in players)
+    return hashlib.blake2b(page.encode(), digest_size=16).hexdigest().encode()
+
+def is_snapshotted(offset: int, limit: int) -> bool:
+    config = app.session.config
+
+    if not config.API_RANKING_SNAPSHOTS:
+        return False
+
+    return offset + limit <= config.API_RANKING_SNAPSHOT_PAGES * 50
+
+def snapshot_ttl() -> int:
+    config = app.session.config
+
+    if not config.API_RESPONSE_CACHE:
+        return config.API_RANKING_SNAPSHOT_MAX_AGE
+
+    return max(config.API_RANKING_SNAPSHOT_MAX_AGE - RESPONSE_TTL, 1)
+
+def fetch(board: str, offset: int, limit: int, signature: bytes, redis: Redis | None = None) -> bytes | None:
+    """Return the rendered page, if the snapshot still matches the current leaderboard"""
+    redis = redis or app.session.redis
+    stored_signature, body = redis.hmget(snapshot_key(board, offset, limit), 'signature', 'body')
+
+    if stored_signature != signature:
+        return None
+
+    return body
+
+def store(
+    board: str,
+    offset: int,
+    limit: int,
+    signature: bytes,
+    body: bytes,
+    user_ids: Iterable[int],
+    redis: Redis | None = None
+) -> None:
+    redis = redis or app.session.redis
+    key = snapshot_key(board, offset, limit)
+    ttl = snapshot_ttl()
+
+    with redis.pipeline(transaction=False) as pipe:
+        pipe.hset(key, mapping={'signature': signature, 'body': body})
+        pipe.expire(key, ttl)
+
+        # Remember which snapshots contain a user, so that
+        # they can be dropped when the user is updated
+        for user_id in user_ids:
+            pipe.sadd(user_key(user_id), key)
+            pipe.expire(user_key(user_id), ttl)
+
+        pipe.execute()
+
+def resolve(
+    board: str,
+    offset: int,
+    limit: int,
+    players: Iterable[Tuple[int, float]],
+    render: Callable[[bool], bytes]
+) -> bytes:
+    """Serve a ranking page from its snapshot, rendering & storing it only if it changed.
+    `render` gets called with `fresh=True` for snapshots, which should bypass the card caches."""
+    players = list(players)
+
+    if not is_snapshotted(offset, limit):
+        return render(False)
+
+    signature = page_signature(players)
+
+    if (body := fetch(board, offset, limit, signature)) is not None:
+        return body
+
+    body = render(True)
+    store(board, offset, limit, signature, body, (user_id for user_id, _ in players))
+    return body
+
+def invalidate_user(user_id: int) -> None:
+    """Drop every snapshot that contains the user, e.g. after a name or country change"""
+    redis = app.session.redis
+
+    if not (keys := redis.smembers(user_key(user_id))):
+        return
+
+    redis.delete(user_key(user_id), *keys)
@@ -0,0 +1,42 @@
+
+from app.models import GroupModel, ForumModel, BeatmapPackModel, TitanicReleaseModel, ModdedReleaseModel
+from app.common.database import groups, forums, packs, releases
+from typing import Callable, Dict, List, Tuple
+from sqlalchemy.orm import Session
+
+from .local import LocalCache
+
+# Small datasets, that are always listed as a whole. Every worker keeps them as
+# validated models & preloads them during the warm-up. They are edited through
+# other services, so the ttl is how long a change can take to show up. The main
+# forums include topic & post counts, which is why they expire sooner.
+# Countries & smileys are constants in code, so there is nothing to load for them.
+DATASETS: Dict[str, Tuple[Callable[[Session], list], type, float]] = {
+    'groups': (lambda session: groups.fetch_all(session=session), GroupModel, 60),
+    'forums': (forums.fetch_main_forums, ForumModel, 10),
+    'packs': (packs.fetch_all, BeatmapPackModel, 60),
+    'releases': (releases.fetch_all, TitanicReleaseModel, 60),
+    'modded_releases': (releases.fetch_modded_all, ModdedReleaseModel, 60)
+}
+
+cache = LocalCache(maxsize=len(DATASETS), ttl=60)
+
+def fetch(name: str, session: Session) -> List:
+    """Resolve the models of a dataset, loading them from the database if they expired"""
+    if (models := cache.get(name)) is not None:
+        return models
+
+    return load(name, session)
+
+def load(name: str, session: Session) -> List:
+    query, model, ttl = DATASETS[name]
+    models = [
+        model.model_validate(entry, from_attributes=True)
+        for entry in query(session)
+    ]
+    cache.set(name, models, ttl)
+    return models
+
+def preload(session: Session) -> None:
+    for name in DATASETS:
+        load(name, session)
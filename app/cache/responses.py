@@ -0,0 +1,86 @@
+
+from redis.asyncio import Redis as RedisAsync
+from typing import Iterable, List, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+import app.session
+import hashlib
+import base64
+import orjson
+
+# Status code, headers & body of a finished response
+CapturedResponse = Tuple[int, List[Tuple[bytes, bytes]], bytes]
+
+def entry_key(digest: str) -> str:
+    return f'responses:entry:{digest}'
+
+def tag_key(tag: str) -> str:
+    return f'responses:tag:{tag}'
+
+def request_digest(method: str, path: str, query_string: bytes, *extra: str) -> str:
+    # Sort the query parameters, so that their order doesn't matter
+    query = sorted(parse_qsl(query_string.decode('latin-1'), keep_blank_values=True))
+    request = ':'.join([method, f'{path}?{urlencode(query)}', *extra])
+    return hashlib.blake2b(request.encode(), digest_size=16).hexdigest()
+
+def serialize_response(response: CapturedResponse) -> bytes:
+    status_code, headers, body = response
+    return orjson.dumps({
+        "status": status_code,
+        "headers": [(name.decode('latin-1'), value.decode('latin-1')) for name, value in headers],
+        "body": base64.b64encode(body).decode()
+    })
+
+def deserialize_response(data: str | bytes) -> CapturedResponse:
+    response = orjson.loads(data)
+    return (
+        response["status"],
+        [(name.encode('latin-1'), value.encode('latin-1')) for name, value in response["headers"]],
+        base64.b64decode(response["body"])
+    )
+
+async def fetch(digest: str, redis: RedisAsync) -> CapturedResponse | None:
+    if not (payload := await redis.get(entry_key(digest))):
+        return None
+
+    return deserialize_response(payload)
+
+async def store(
+    digest: str,
+    response: CapturedResponse,
+    tags: Iterable[str],
+    ttl: int,
+    redis: RedisAsync
+) -> None:
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.set(entry_key(digest), serialize_response(response), ex=ttl)
+
+        for tag in tags:
+            # Keep the tag around for as long as its longest-living entry
+            pipe.sadd(tag_key(tag), digest)
+            pipe.expire(tag_key(tag), ttl, nx=True)
+            pipe.expire(tag_key(tag), ttl, gt=True)
+
+        await pipe.execute()
+
+def purge(*tags: str) -> None:
+    """Remove all cached responses that were tagged with any of the given tags"""
+    if not tags or not app.session.config.API_RESPONSE_CACHE:
+        return
+
+    with app.session.redis.pipeline(transaction=False) as pipe:
+        for tag in tags:
+            pipe.smembers(tag_key(tag))
+
+        members = pipe.execute()
+
+    digests = {
+        digest.decode() if isinstance(digest, bytes) else digest
+        for tag_members in members
+        for digest in tag_members
+    }
+
+    app.session.redis.delete(
+        *(tag_key(tag) for tag in tags),
+        *(entry_key(digest) for digest in digests)
+    )
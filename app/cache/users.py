@@ -0,0 +1,131 @@
+
+from sqlalchemy.orm import make_transient_to_detached
+from app.common.database.objects import DBUser
+from redis.asyncio import Redis as RedisAsync
+from typing import List, Tuple
+from sqlalchemy import inspect
+from datetime import datetime
+
+from .local import LocalCache
+from . import cards, credentials, rankings, responses
+
+import app.session
+import json
+
+# Entries are only kept for a short time in-process, since other
+# workers & services can only invalidate the shared redis entry
+LOCAL_TTL = 10
+REDIS_TTL = 300
+
+# Group & permission changes made outside of keel can't invalidate the
+# cache, so a revoked permission stays effective for up to this long
+PERMISSIONS_TTL = 30
+
+# Columns that are never written to the cache, they
+# will be lazy-loaded from the database when accessed
+EXCLUDED_COLUMNS = {'bcrypt'}
+
+cache = LocalCache(maxsize=4096, ttl=LOCAL_TTL)
+
+columns = [
+    attribute.key
+    for attribute in inspect(DBUser).column_attrs
+    if attribute.key not in EXCLUDED_COLUMNS
+]
+
+def is_datetime_column(attribute) -> bool:
+    try:
+        return attribute.columns[0].type.python_type is datetime
+    except NotImplementedError:
+        return False
+
+datetime_columns = {
+    attribute.key
+    for attribute in inspect(DBUser).column_attrs
+    if is_datetime_column(attribute)
+}
+
+def user_key(user_id: int) -> str:
+    return f'authentication:user:{user_id}'
+
+def permissions_key(user_id: int) -> str:
+    return f'authentication:permissions:{user_id}'
+
+def serialize_user(user: DBUser) -> dict:
+    return {
+        column: (
+            value.isoformat()
+            if isinstance(value := getattr(user, column), datetime)
+            else value
+        )
+        for column in columns
+    }
+
+def deserialize_user(row: dict) -> DBUser:
+    user = DBUser(**{
+        column: (
+            datetime.fromisoformat(value)
+            if column in datetime_columns and value is not None
+            else value
+        )
+        for column, value in row.items()
+    })
+
+    # Turn the object into a detached instance, so that it can be
+    # merged into a request session without querying the database
+    make_transient_to_detached(user)
+    return user
+
+async def fetch_user(user_id: int, redis: RedisAsync) -> DBUser | None:
+    if (row := cache.get(('user', user_id))) is not None:
+        return deserialize_user(row)
+
+    if not (payload := await redis.get(user_key(user_id))):
+        return None
+
+    row = json.loads(payload)
+    cache.set(('user', user_id), row)
+    return deserialize_user(row)
+
+async def store_user(user: DBUser, redis: RedisAsync) -> None:
+    row = serialize_user(user)
+    cache.set(('user', user.id), row)
+    await redis.set(user_key(user.id), json.dumps(row), ex=REDIS_TTL)
+
+async def fetch_permissions(user_id: int, redis: RedisAsync) -> Tuple[List[str], List[str]] | None:
+    if (permissions := cache.get(('permissions', user_id))) is not None:
+        return permissions
+
+    if not (payload := await redis.get(permissions_key(user_id))):
+        return None
+
+    granted, rejected = json.loads(payload)
+    cache.set(('permissions', user_id), (granted, rejected))
+    return granted, rejected
+
+async def store_permissions(user_id: int, granted: List[str], rejected: List[str], redis: RedisAsync) -> None:
+    cache.set(('permissions', user_id), (granted, rejected))
+    await redis.set(permissions_key(user_id), json.dumps([list(granted), list(rejected)]), ex=PERMISSIONS_TTL)
+
+def prime(user_id: int, user_payload: str | None, permissions_payload: str | None) -> None:
+    """Fill the local cache with entries, that were fetched from redis as part of another call"""
+    if user_payload:
+        cache.set(('user', user_id), json.loads(user_payload))
+
+    if permissions_payload:
+        granted, rejected = json.loads(permissions_payload)
+        cache.set(('permissions', user_id), (granted, rejected))
+
+def invalidate(user_id: int) -> None:
+    """Remove the cached user, card, permissions, profile responses & ranking snapshots, e.g. after a profile, group or restriction change"""
+    cache.pop(('user', user_id))
+    cache.pop(('permissions', user_id))
+    app.session.redis.delete(user_key(user_id), permissions_key(user_id))
+    credentials.invalidate(user_id)
+    cards.invalidate(user_id)
+    responses.purge(f'user:{user_id}')
+    rankings.invalidate_user(user_id)
+
+def invalidate_permissions(user_id: int) -> None:
+    cache.pop(('permissions', user_id))
+    app.session.redis.delete(permissions_key(user_id))
@@ -0,0 +1,39 @@
+
+from app.common.config import Config
+
+class KeelConfig(Config):
+    """Settings that are specific to keel, on top of the shared configuration"""
+
+    # Size of the thread pools used for blocking & cpu-bound work
+    API_EXECUTOR_IO_WORKERS: int = 32
+    API_EXECUTOR_CPU_WORKERS: int = 4
+
+    # Run bcrypt checks in a process pool, so that they don't hold the GIL
+    API_BCRYPT_PROCESS_POOL: bool = False
+    API_BCRYPT_WORKERS: int = 2
+
+    # Remember successful basic authentications for a short time
+    API_BASIC_AUTH_CACHE: bool = False
+    API_BASIC_AUTH_CACHE_TTL: int = 60
+
+    # Let identical concurrent anonymous GET requests share a single response
+    API_REQUEST_COALESCING: bool = False
+    API_REQUEST_COALESCING_DISTRIBUTED: bool = False
+    API_REQUEST_COALESCING_TIMEOUT: int = 5
+
+    # Cache anonymous responses of public read endpoints in redis
+    API_RESPONSE_CACHE: bool = False
+
+    # Serve the first pages of every leaderboard from pre-rendered snapshots
+    API_RANKING_SNAPSHOTS: bool = False
+    API_RANKING_SNAPSHOT_PAGES: int = 10
+    API_RANKING_SNAPSHOT_MAX_AGE: int = 60
+
+    # Countries are refreshed when redis reports changes to their leaderboards,
+    # and all of them are recomputed in this interval to correct any drift
+    API_COUNTRY_RANKINGS_KEYSPACE_EVENTS: bool = True
+    API_COUNTRY_RANKINGS_RECOMPUTE_INTERVAL: int = 600
+
+    # Open connections & preload the reference data before a worker starts serving
+    API_WARMUP: bool = True
+    API_WARMUP_CONNECTIONS: int = 4
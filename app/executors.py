@@ -0,0 +1,103 @@
+
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Tuple
+from threading import Lock
+
+from app.metrics import collector
+
+import app.session
+import asyncio
+import time
+
+class NamedExecutor:
+    """Bounded pool for a specific kind of work, which records its queue depth & wait times"""
+
+    def __init__(self, name: str, executor: Executor, workers: int) -> None:
+        self.name = name
+        self.executor = executor
+        self.workers = workers
+        self.lock = Lock()
+        self.pending = 0
+
+        collector.register_gauge(f'executor_{name}_queue_depth', lambda: self.pending)
+        collector.register_gauge(f'executor_{name}_workers', lambda: self.workers)
+
+    async def run(self, func: Callable, *args) -> Any:
+        """Run a function inside the pool, without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        self.enqueue()
+
+        try:
+            waited, result = await loop.run_in_executor(
+                self.executor, timed_call,
+                func, args, time.time()
+            )
+        except BaseException:
+            self.dequeue()
+            raise
+
+        self.dequeue(waited)
+        return result
+
+    def call(self, func: Callable, *args) -> Any:
+        """Run a function inside the pool & block the calling thread until it's done"""
+        self.enqueue()
+
+        try:
+            waited, result = self.executor.submit(
+                timed_call, func, args, time.time()
+            ).result()
+        except BaseException:
+            self.dequeue()
+            raise
+
+        self.dequeue(waited)
+        return result
+
+    def enqueue(self) -> None:
+        with self.lock:
+            self.pending += 1
+
+    def dequeue(self, waited: float | None = None) -> None:
+        with self.lock:
+            self.pending -= 1
+
+        if waited is not None:
+            collector.observe_summary(f'executor_{self.name}_wait_seconds', waited)
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+def timed_call(func: Callable, args: Tuple, submitted_at: float) -> Tuple[float, Any]:
+    # Returns the time the task spent waiting in the queue
+    # together with the result, so it also works across processes
+    waited = time.time() - submitted_at
+    return waited, func(*args)
+
+def create_bcrypt_executor() -> Executor:
+    if app.session.config.API_BCRYPT_PROCESS_POOL:
+        return ProcessPoolExecutor(app.session.config.API_BCRYPT_WORKERS)
+
+    return ThreadPoolExecutor(
+        app.session.config.API_BCRYPT_WORKERS,
+        thread_name_prefix='keel-bcrypt'
+    )
+
+executors: Dict[str, NamedExecutor] = {
+    # Blocking I/O, e.g. database queries & http requests
+    'io': NamedExecutor('io', ThreadPoolExecutor(
+        app.session.config.API_EXECUTOR_IO_WORKERS,
+        thread_name_prefix='keel-io'
+    ), app.session.config.API_EXECUTOR_IO_WORKERS),
+    # CPU-bound work, e.g. image processing
+    'cpu': NamedExecutor('cpu', ThreadPoolExecutor(
+        app.session.config.API_EXECUTOR_CPU_WORKERS,
+        thread_name_prefix='keel-cpu'
+    ), app.session.config.API_EXECUTOR_CPU_WORKERS),
+    # Password hashing, kept separate so that login bursts can't starve other work
+    'bcrypt': NamedExecutor('bcrypt', create_bcrypt_executor(), app.session.config.API_BCRYPT_WORKERS)
+}
+
+def shutdown() -> None:
+    for executor in executors.values():
+        executor.shutdown()
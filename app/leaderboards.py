@@ -0,0 +1,389 @@
+
+from app.common.constants import COUNTRIES
+from typing import Dict, Iterable, List, Tuple
+from redis.asyncio import Redis as RedisAsync
+from redis.exceptions import ResponseError
+from redis import Redis
+
+from app.executors import executors
+
+import app.session
+import asyncio
+
+ORDERS = ('performance', 'rscore', 'tscore', 'ppv1')
+MODES = range(4)
+
+# Leaderboards that are summed up per country, the user count is
+# based on the members of the first one
+COUNTRY_ORDERS = ('performance', 'rscore', 'tscore')
+
+# Seconds in which changes to the country leaderboards are collected,
+# before the affected countries get refreshed
+COUNTRY_REFRESH_DELAY = 5
+
+# Field names of `RankingStatsModel`, in the order returned by `RANKS_SCRIPT`
+RANK_FIELDS = (
+    'global_rank', 'country_rank',
+    'score_rank', 'score_rank_country',
+    'total_score_rank', 'total_score_rank_country',
+    'ppv1_rank', 'ppv1_rank_country'
+)
+
+# KEYS: the global leaderboards of every order, followed by the same
+# leaderboards for each country. ARGV: pairs of user id & country position.
+# Returns the global & country rank of every order for each user, 0 if unranked.
+RANKS_SCRIPT = """
+local orders = 4
+local result = {}
+
+for i = 1, #ARGV, 2 do
+    local offset = tonumber(ARGV[i + 1]) * orders
+
+    for order = 1, orders do
+        local rank = redis.call('ZREVRANK', KEYS[order], ARGV[i])
+        local country_rank = redis.call('ZREVRANK', KEYS[offset + order], ARGV[i])
+        result[#result + 1] = rank and rank + 1 or 0
+        result[#result + 1] = country_rank and country_rank + 1 or 0
+    end
+end
+
+return result
+"""
+
+# KEYS: the leaderboard. ARGV: user id & amount of players on each side.
+# Returns the start index of the window & its members with their scores,
+# or an empty result if the user is not ranked.
+AROUND_SCRIPT = """
+local rank = redis.call('ZREVRANK', KEYS[1], ARGV[1])
+
+if not rank then
+    return {}
+end
+
+local radius = tonumber(ARGV[2])
+local start = math.max(rank - radius, 0)
+return {start, redis.call('ZREVRANGE', KEYS[1], start, rank + radius, 'WITHSCORES')}
+"""
+
+# KEYS: the country aggregates of a mode, followed by the country leaderboards
+# of the user. ARGV: user id, country & either "" to add or "-" to subtract
+# the user's current scores.
+COUNTRY_DELTA_SCRIPT = """
+local pp = redis.call('ZSCORE', KEYS[2], ARGV[1])
+
+if not pp then
+    return 0
+end
+
+local rscore = redis.call('ZSCORE', KEYS[3], ARGV[1]) or '0'
+local tscore = redis.call('ZSCORE', KEYS[4], ARGV[1]) or '0'
+local sign = ARGV[3]
+redis.call('HINCRBY', KEYS[1], ARGV[2] .. ':users', sign .. '1')
+redis.call('HINCRBYFLOAT', KEYS[1], ARGV[2] .. ':performance', sign .. pp)
+redis.call('HINCRBYFLOAT', KEYS[1], ARGV[2] .. ':rscore', sign .. rscore)
+redis.call('HINCRBYFLOAT', KEYS[1], ARGV[2] .. ':tscore', sign .. tscore)
+return 1
+"""
+
+# KEYS: the country aggregates of a mode, followed by the country leaderboards.
+# ARGV: the country. Sums up the leaderboards & replaces the country's aggregates
+# in one call, so that no change can happen in between. Returns 1 if the previous
+# aggregates were off, e.g. because of missed changes.
+COUNTRY_REFRESH_SCRIPT = """
+local entries = redis.call('ZRANGE', KEYS[2], 0, -1, 'WITHSCORES')
+local current = {#entries / 2, 0, 0, 0}
+
+for i = 1, #entries, 2 do
+    current[2] = current[2] + tonumber(entries[i + 1])
+    current[3] = current[3] + tonumber(redis.call('ZSCORE', KEYS[3], entries[i]) or 0)
+    current[4] = current[4] + tonumber(redis.call('ZSCORE', KEYS[4], entries[i]) or 0)
+end
+
+local fields = {ARGV[1] .. ':users', ARGV[1] .. ':performance', ARGV[1] .. ':rscore', ARGV[1] .. ':tscore'}
+local previous = redis.call('HMGET', KEYS[1], unpack(fields))
+local drifted = 0
+
+for i = 1, 4 do
+    if math.abs((tonumber(previous[i]) or 0) - current[i]) > 0.01 then
+        drifted = 1
+    end
+end
+
+if current[1] == 0 then
+    redis.call('HDEL', KEYS[1], unpack(fields))
+    return drifted
+end
+
+for i = 1, 4 do
+    -- Written with full precision, since tostring() would round the sums
+    redis.call('HSET', KEYS[1], fields[i], string.format('%.17g', current[i]))
+end
+
+return drifted
+"""
+
+ranks_script = app.session.redis.register_script(RANKS_SCRIPT)
+around_script = app.session.redis_async.register_script(AROUND_SCRIPT)
+country_delta_script = app.session.redis.register_script(COUNTRY_DELTA_SCRIPT)
+country_refresh_script = app.session.redis.register_script(COUNTRY_REFRESH_SCRIPT)
+
+def leaderboard_key(order: str, mode: int, country: str | None = None) -> str:
+    suffix = f':{country.lower()}' if country else ''
+    return f'bancho:{order}:{mode}{suffix}'
+
+def leaderboard_keys(mode: int, country: str | None = None) -> List[str]:
+    return [leaderboard_key(order, mode, country) for order in ORDERS]
+
+def fetch_ranks(
+    users: Iterable[Tuple[int, str]],
+    mode: int,
+    redis: Redis | None = None
+) -> Dict[int, Dict[str, int]]:
+    """Resolve the global & country ranks of a batch of (user id, country) pairs in one call"""
+    users = list(users)
+
+    if not users:
+        return {}
+
+    countries = {}
+    keys = leaderboard_keys(mode)
+    args = []
+
+    for user_id, country in users:
+        if (country := country.lower()) not in countries:
+            countries[country] = len(countries) + 1
+            keys.extend(leaderboard_keys(mode, country))
+
+        args.extend((user_id, countries[country]))
+
+    ranks = ranks_script(keys=keys, args=args, client=redis or app.session.redis)
+    fields = len(RANK_FIELDS)
+
+    return {
+        user_id: dict(zip(RANK_FIELDS, ranks[index * fields:(index + 1) * fields]))
+        for index, (user_id, _) in enumerate(users)
+    }
+
+async def fetch_around(
+    user_id: int,
+    order: str,
+    mode: int,
+    radius: int,
+    country: str | None = None,
+    redis: RedisAsync | None = None
+) -> Tuple[int, List[Tuple[int, float]]] | None:
+    """Resolve the rank of a user & the players around them in one call, as (offset, players)"""
+    result = await around_script(
+        keys=[leaderboard_key(order, mode, country)],
+        args=[user_id, radius],
+        client=redis or app.session.redis_async
+    )
+
+    if not result:
+        return None
+
+    offset, entries = result
+    players = [
+        (int(entries[index]), float(entries[index + 1]))
+        for index in range(0, len(entries), 2)
+    ]
+    return offset, players
+
+def country_aggregates_key(mode: int) -> str:
+    return f'rankings:countries:{mode}'
+
+def country_recompute_lock_key(mode: int) -> str:
+    return f'rankings:countries:{mode}:lock'
+
+def country_changes_key() -> str:
+    return 'rankings:countries:changes'
+
+def fetch_country_rankings(mode: int, redis: Redis | None = None) -> List[dict]:
+    """Read the precomputed country rankings of a mode"""
+    redis = redis or app.session.redis
+    countries: Dict[str, dict] = {}
+
+    for field, value in redis.hgetall(country_aggregates_key(mode)).items():
+        country, metric = field.decode().split(':')
+        countries.setdefault(country, {'name': country})[metric] = float(value)
+
+    rankings = [
+        {
+            'name': country['name'],
+            'average_pp': country.get('performance', 0) / country['users'],
+            'total_performance': country.get('performance', 0),
+            'total_rscore': int(country.get('rscore', 0)),
+            'total_tscore': int(country.get('tscore', 0)),
+            'total_users': int(country['users'])
+        }
+        for country in countries.values()
+        if country.get('users', 0) > 0
+    ]
+    rankings.sort(key=lambda country: country['total_performance'], reverse=True)
+    return rankings
+
+def add_country_contribution(user_id: int, country: str, modes: Iterable[int] = MODES) -> None:
+    """Add the current scores of a user to their country, e.g. after they were added to its leaderboards"""
+    apply_country_delta(user_id, country, '', modes)
+
+def remove_country_contribution(user_id: int, country: str, modes: Iterable[int] = MODES) -> None:
+    """Subtract the current scores of a user from their country, before they get removed from its leaderboards"""
+    apply_country_delta(user_id, country, '-', modes)
+
+def apply_country_delta(user_id: int, country: str, sign: str, modes: Iterable[int]) -> None:
+    country = country.lower()
+
+    with app.session.redis.pipeline(transaction=False) as pipe:
+        for mode in modes:
+            country_delta_script(
+                keys=[
+                    country_aggregates_key(mode),
+                    *(leaderboard_key(order, mode, country) for order in COUNTRY_ORDERS)
+                ],
+                args=[user_id, country, sign],
+                client=pipe
+            )
+
+        pipe.execute()
+
+def refresh_country_aggregates(countries: Iterable[Tuple[int, str]], redis: Redis | None = None) -> int:
+    """Rebuild the aggregates of the given (mode, country) pairs from their leaderboards, returning the amount of drifted ones"""
+    redis = redis or app.session.redis
+
+    with redis.pipeline(transaction=False) as pipe:
+        for mode, country in countries:
+            country_refresh_script(
+                keys=[
+                    country_aggregates_key(mode),
+                    *(leaderboard_key(order, mode, country) for order in COUNTRY_ORDERS)
+                ],
+                args=[country.lower()],
+                client=pipe
+            )
+
+        return sum(pipe.execute())
+
+def recompute_country_aggregates(mode: int, redis: Redis | None = None) -> int | None:
+    """Rebuild the aggregates of every country in a mode, returning the amount of drifted countries"""
+    redis = redis or app.session.redis
+    interval = app.session.config.API_COUNTRY_RANKINGS_RECOMPUTE_INTERVAL
+
+    # Only one worker recomputes the aggregates in each interval
+    if not redis.set(country_recompute_lock_key(mode), 1, nx=True, ex=interval):
+        return None
+
+    drifted = refresh_country_aggregates(
+        ((mode, country) for country in COUNTRIES),
+        redis
+    )
+
+    if drifted:
+        app.session.logger.info(f'Corrected {drifted} drifted country aggregates of mode {mode}')
+
+    return drifted
+
+def refresh_changed_countries(changed: Iterable[Tuple[int, str]], redis: Redis | None = None) -> None:
+    """Queue the changed countries of this worker & refresh every queued country, that no other worker took yet"""
+    redis = redis or app.session.redis
+    changed = [f'{mode}:{country}' for mode, country in changed]
+
+    # Every worker receives the same notifications, so the changes are
+    # collected in one set & whoever pops them first refreshes them
+    with redis.pipeline(transaction=False) as pipe:
+        if changed:
+            pipe.sadd(country_changes_key(), *changed)
+
+        pipe.spop(country_changes_key(), len(COUNTRIES) * len(MODES))
+        *_, queued = pipe.execute()
+
+    if not queued:
+        return
+
+    refresh_country_aggregates(
+        (int(mode), country)
+        for mode, country in (entry.decode().split(':') for entry in queued)
+    )
+
+def parse_country_leaderboard(channel: str) -> Tuple[int, str] | None:
+    # e.g. "__keyspace@0__:bancho:performance:0:de"
+    _, _, key = channel.partition('__:')
+    prefix, order, mode, *country = key.split(':')
+
+    if prefix != 'bancho' or order not in COUNTRY_ORDERS or len(country) != 1 or not mode.isdigit():
+        return None
+
+    return int(mode), country[0]
+
+def enable_keyspace_events(redis: Redis | None = None) -> bool:
+    """Make sure that redis publishes keyspace notifications for sorted sets"""
+    redis = redis or app.session.redis
+
+    try:
+        flags = redis.config_get('notify-keyspace-events').get('notify-keyspace-events', '')
+        missing = ''.join(
+            flag for flag in 'Kz'
+            if flag not in flags and not (flag == 'z' and 'A' in flags)
+        )
+
+        if missing:
+            redis.config_set('notify-keyspace-events', flags + missing)
+    except ResponseError as e:
+        app.session.logger.warning(
+            f'Failed to enable keyspace notifications, country rankings '
+            f'only update on full recomputes: {e}'
+        )
+        return False
+
+    return True
+
+async def watch_country_leaderboards() -> None:
+    """Refresh the aggregates of countries, shortly after their leaderboards were changed by a stats update"""
+    if not app.session.config.API_COUNTRY_RANKINGS_KEYSPACE_EVENTS:
+        return
+
+    if not await executors['io'].run(enable_keyspace_events):
+        return
+
+    loop = asyncio.get_running_loop()
+
+    while True:
+        try:
+            async with app.session.redis_async.pubsub() as pubsub:
+                await pubsub.psubscribe(*(
+                    f'__keyspace@*__:{leaderboard_key(order, "*", "*")}'
+                    for order in COUNTRY_ORDERS
+                ))
+                changed = set()
+                refresh_at = loop.time() + COUNTRY_REFRESH_DELAY
+
+                while True:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True,
+                        timeout=max(refresh_at - loop.time(), 0)
+                    )
+
+                    if message and (country := parse_country_leaderboard(message['channel'])):
+                        changed.add(country)
+
+                    if loop.time() < refresh_at:
+                        continue
+
+                    await executors['io'].run(refresh_changed_countries, changed)
+                    changed = set()
+                    refresh_at = loop.time() + COUNTRY_REFRESH_DELAY
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            app.session.logger.warning(f'Failed to refresh changed countries: {e}', exc_info=e)
+            await asyncio.sleep(COUNTRY_REFRESH_DELAY)
+
+async def maintain_country_aggregates() -> None:
+    """Periodically recompute the country aggregates in the background, which corrects any drift & missed changes"""
+    while True:
+        for mode in MODES:
+            try:
+                await executors['io'].run(recompute_country_aggregates, mode)
+            except Exception as e:
+                app.session.logger.warning(f'Failed to recompute country aggregates: {e}', exc_info=e)
+
+        await asyncio.sleep(app.session.config.API_COUNTRY_RANKINGS_RECOMPUTE_INTERVAL)
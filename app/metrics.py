@@ -0,0 +1,209 @@
+
+from redis.asyncio import Redis as RedisAsync
+from collections import defaultdict
+from typing import Callable, Dict, List, Tuple
+from redis import Redis
+
+import app.session
+import asyncio
+import logging
+import time
+import os
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Every worker collects metrics locally & periodically adds
+# them to the shared redis hashes, which get read on scrape
+FLUSH_INTERVAL = 5
+GAUGES_EXPIRY = 30
+
+REQUESTS_KEY = 'metrics:requests'
+LATENCY_KEY = 'metrics:latency'
+RESPONSE_SIZE_KEY = 'metrics:response_size'
+COUNTERS_KEY = 'metrics:counters'
+SUMMARIES_KEY = 'metrics:summaries'
+GAUGES_KEY = 'metrics:gauges'
+
+class MetricsCollector:
+    def __init__(self) -> None:
+        self.logger = logging.getLogger('metrics')
+        self.requests: Dict[Tuple[str, str, int], int] = defaultdict(int)
+        self.latency: Dict[Tuple[str, str, str], float] = defaultdict(float)
+        self.response_size: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.counters: Dict[str, int] = defaultdict(int)
+        self.summaries: Dict[str, List[float]] = defaultdict(lambda: [0.0, 0])
+        self.gauges: Dict[str, Callable[[], float]] = {}
+        self.last_flush = time.monotonic()
+        self.flush_task: asyncio.Task | None = None
+        self.in_flight = 0
+        self.register_gauge('http_requests_in_flight', lambda: self.in_flight)
+
+    def increment(self, name: str, value: int = 1) -> None:
+        self.counters[name] += value
+
+    def observe_summary(self, name: str, value: float) -> None:
+        summary = self.summaries[name]
+        summary[0] += value
+        summary[1] += 1
+
+    def register_gauge(self, name: str, callback: Callable[[], float]) -> None:
+        """Register a gauge, which gets summed up across all workers"""
+        self.gauges[name] = callback
+
+    def observe(self, method: str, route: str, status: int, duration: float, size: int) -> None:
+        self.requests[method, route, status] += 1
+        self.response_size[method, route] += size
+        self.latency[method, route, 'sum'] += duration
+        self.latency[method, route, resolve_bucket(duration)] += 1
+
+        if time.monotonic() - self.last_flush < FLUSH_INTERVAL:
+            return
+
+        if self.flush_task and not self.flush_task.done():
+            return
+
+        self.last_flush = time.monotonic()
+        self.flush_task = asyncio.create_task(self.flush(app.session.redis_async))
+
+    async def flush(self, redis: RedisAsync) -> None:
+        requests, self.requests = self.requests, defaultdict(int)
+        latency, self.latency = self.latency, defaultdict(float)
+        response_size, self.response_size = self.response_size, defaultdict(int)
+        counters, self.counters = self.counters, defaultdict(int)
+        summaries, self.summaries = self.summaries, defaultdict(lambda: [0.0, 0])
+        gauges = {name: callback() for name, callback in self.gauges.items()}
+
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                for labels, value in requests.items():
+                    pipe.hincrby(REQUESTS_KEY, encode_field(*labels), value)
+
+                for labels, value in latency.items():
+                    pipe.hincrbyfloat(LATENCY_KEY, encode_field(*labels), value)
+
+                for labels, value in response_size.items():
+                    pipe.hincrby(RESPONSE_SIZE_KEY, encode_field(*labels), value)
+
+                for name, value in counters.items():
+                    pipe.hincrby(COUNTERS_KEY, name, value)
+
+                for name, (total, count) in summaries.items():
+                    pipe.hincrbyfloat(SUMMARIES_KEY, encode_field(name, 'sum'), total)
+                    pipe.hincrby(SUMMARIES_KEY, encode_field(name, 'count'), count)
+
+                # Gauges are stored per worker & expire with it
+                pipe.hset(f'{GAUGES_KEY}:{os.getpid()}', mapping=gauges)
+                pipe.expire(f'{GAUGES_KEY}:{os.getpid()}', GAUGES_EXPIRY)
+                await pipe.execute()
+        except Exception as e:
+            self.logger.warning(f'Failed to flush metrics: {e}')
+
+def resolve_bucket(duration: float) -> str:
+    for bucket in LATENCY_BUCKETS:
+        if duration <= bucket:
+            return str(bucket)
+
+    return '+Inf'
+
+def encode_field(*labels) -> str:
+    return '|'.join(str(label) for label in labels)
+
+def decode_field(field: bytes | str) -> List[str]:
+    if isinstance(field, bytes):
+        field = field.decode()
+
+    return field.split('|')
+
+def escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def render(redis: Redis) -> str:
+    """Render the metrics of all workers in the prometheus text format"""
+    with redis.pipeline(transaction=False) as pipe:
+        pipe.hgetall(REQUESTS_KEY)
+        pipe.hgetall(LATENCY_KEY)
+        pipe.hgetall(RESPONSE_SIZE_KEY)
+        pipe.hgetall(COUNTERS_KEY)
+        pipe.hgetall(SUMMARIES_KEY)
+        requests, latency, response_size, counters, summaries = pipe.execute()
+
+    gauges: Dict[str, float] = defaultdict(float)
+
+    for key in redis.scan_iter(f'{GAUGES_KEY}:*'):
+        for name, value in redis.hgetall(key).items():
+            gauges[decode_field(name)[0]] += float(value)
+
+    lines = [
+        '# HELP keel_http_requests_total Total amount of http requests',
+        '# TYPE keel_http_requests_total counter'
+    ]
+
+    for field, value in sorted(requests.items()):
+        method, route, status = map(escape_label, decode_field(field))
+        lines.append(
+            f'keel_http_requests_total{{method="{method}",route="{route}",status="{status}"}} {int(value)}'
+        )
+
+    lines.extend([
+        '# HELP keel_http_request_duration_seconds Latency of http requests',
+        '# TYPE keel_http_request_duration_seconds histogram'
+    ])
+
+    histograms: Dict[Tuple[str, str], Dict[str, float]] = defaultdict(dict)
+
+    for field, value in latency.items():
+        method, route, bucket = decode_field(field)
+        histograms[method, route][bucket] = float(value)
+
+    for (method, route), values in sorted(histograms.items()):
+        labels = f'method="{escape_label(method)}",route="{escape_label(route)}"'
+        cumulative = 0
+
+        for bucket in (*map(str, LATENCY_BUCKETS), '+Inf'):
+            cumulative += int(values.get(bucket, 0))
+            lines.append(f'keel_http_request_duration_seconds_bucket{{{labels},le="{bucket}"}} {cumulative}')
+
+        lines.append(f'keel_http_request_duration_seconds_sum{{{labels}}} {values.get("sum", 0)}')
+        lines.append(f'keel_http_request_duration_seconds_count{{{labels}}} {cumulative}')
+
+    lines.extend([
+        '# HELP keel_http_response_size_bytes_total Total size of http response bodies',
+        '# TYPE keel_http_response_size_bytes_total counter'
+    ])
+
+    for field, value in sorted(response_size.items()):
+        method, route = map(escape_label, decode_field(field))
+        lines.append(
+            f'keel_http_response_size_bytes_total{{method="{method}",route="{route}"}} {int(value)}'
+        )
+
+    for name, value in sorted(counters.items()):
+        name = decode_field(name)[0]
+        lines.extend([
+            f'# TYPE keel_{name}_total counter',
+            f'keel_{name}_total {int(value)}'
+        ])
+
+    summary_values: Dict[str, Dict[str, float]] = defaultdict(dict)
+
+    for field, value in summaries.items():
+        name, suffix = decode_field(field)
+        summary_values[name][suffix] = float(value)
+
+    for name, values in sorted(summary_values.items()):
+        lines.extend([
+            f'# TYPE keel_{name} summary',
+            f'keel_{name}_sum {values.get("sum", 0)}',
+            f'keel_{name}_count {int(values.get("count", 0))}'
+        ])
+
+    for name, value in sorted(gauges.items()):
+        lines.extend([
+            f'# TYPE keel_{name} gauge',
+            f'keel_{name} {value:g}'
+        ])
+
+    return '\n'.join(lines) + '\n'
+
+collector = MetricsCollector()
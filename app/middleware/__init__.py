@@ -1,7 +1,10 @@
 
+from . import coalescing
+from . import caching
 from . import csrf
 from . import metrics
 from . import ratelimiting
 from . import authentication
+from . import bootstrap
 from . import state
 from . import cors
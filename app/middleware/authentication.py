@@ -7,7 +7,8 @@ from typing import List, Tuple
 from app.common.database.repositories import users
 from app.common.helpers import permissions
 from app.common.database import DBUser
-from app import api, utils
+from app.session import config
+from app import api, cache, utils
 
 import app.security as security
 import logging
@@ -27,7 +28,7 @@ class AuthBackend(AuthenticationBackend):
             user = await self.session_authentication(session_id, request)
 
             if user:
-                scopes = await self.resolve_user_scopes(user)
+                scopes = await self.resolve_user_scopes(user, request)
                 return AuthCredentials(scopes), user
 
             self.logger.warning('Invalid website session')
@@ -58,12 +59,21 @@ class AuthBackend(AuthenticationBackend):
             self.logger.warning(f'Invalid credentials for {authorization["scheme"]}')
             return AuthCredentials([]), UnauthenticatedUser()
 
-        scopes = await self.resolve_user_scopes(user)
+        scopes = await self.resolve_user_scopes(user, request)
         return AuthCredentials(scopes), user
 
     async def basic_authentication(self, data: str, request: HTTPConnection) -> DBUser | None:
         username, password = base64.b64decode(data).decode().split(':', 1)
 
+        if config.API_BASIC_AUTH_CACHE:
+            user_id = await cache.credentials.fetch(
+                username, password,
+                request.state.redis_async
+            )
+
+            if user_id is not None:
+                return await self.fetch_user(user_id, request)
+
         user: DBUser = await utils.run_async(
             users.fetch_by_name_case_insensitive,
             username, request.state.db
@@ -79,6 +89,12 @@ class AuthBackend(AuthenticationBackend):
         if not is_correct:
             return None
 
+        if config.API_BASIC_AUTH_CACHE:
+            await cache.credentials.store(
+                username, password, user.id,
+                request.state.redis_async
+            )
+
         return user
 
     async def token_authentication(self, token: str, request: HTTPConnection) -> DBUser | None:
@@ -90,33 +106,60 @@ class AuthBackend(AuthenticationBackend):
         if not data:
             return None
 
-        return await utils.run_async(
-            users.fetch_by_id_no_options,
-            data['id'], request.state.db
-        )
+        return await self.fetch_user(data['id'], request)
 
     async def session_authentication(self, session_id: str, request: HTTPConnection) -> DBUser | None:
-        data = await security.validate_website_session(
-            session_id,
-            request.state.redis_async
-        )
+        bootstrap = getattr(request.state, 'bootstrap', {})
+
+        if bootstrap.get('session_id') == session_id:
+            # The session was already fetched at the start of the request
+            data = bootstrap['website_session']
+        else:
+            data = await security.validate_website_session(
+                session_id,
+                request.state.redis_async
+            )
 
         if not data:
             return None
 
-        return await utils.run_async(
+        return await self.fetch_user(data['user_id'], request)
+
+    async def fetch_user(self, user_id: int, request: HTTPConnection) -> DBUser | None:
+        redis = request.state.redis_async
+
+        if user := await cache.users.fetch_user(user_id, redis):
+            # Attach the cached user to the request session
+            return request.state.db.merge(user, load=False)
+
+        user = await utils.run_async(
             users.fetch_by_id_no_options,
-            data['user_id'], request.state.db
+            user_id, request.state.db
         )
 
-    async def fetch_user_permissions(self, user_id: int) -> Tuple[List[str], List[str]]:
-        return await utils.run_async(
-            permissions.fetch_all,
-            user_id
-        )
+        if user:
+            await cache.users.store_user(user, redis)
+
+        return user
+
+    async def fetch_user_permissions(self, user_id: int, request: HTTPConnection) -> Tuple[List[str], List[str]]:
+        redis = request.state.redis_async
+        request.state.permission_fetches = getattr(request.state, 'permission_fetches', 0) + 1
+
+        if not (cached := await cache.users.fetch_permissions(user_id, redis)):
+            granted, rejected = await utils.run_async(
+                permissions.fetch_all,
+                user_id
+            )
+            await cache.users.store_permissions(user_id, granted, rejected, redis)
+            cached = granted, rejected
+
+        # Share the permissions with `requires` & `has_permission` for this request
+        request.state.permissions = cached
+        return cached
 
-    async def resolve_user_scopes(self, user: DBUser) -> List[str]:
-        granted, rejected = await self.fetch_user_permissions(user.id)
+    async def resolve_user_scopes(self, user: DBUser, request: HTTPConnection) -> List[str]:
+        granted, rejected = await self.fetch_user_permissions(user.id, request)
         scopes = ['users.authenticated', *granted]
 
         for rejected_scope in rejected:
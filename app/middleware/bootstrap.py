@@ -0,0 +1,124 @@
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+from starlette.requests import Request
+from redis.asyncio.client import Pipeline
+
+from app.common.config import config_instance as config
+from app.middleware.ratelimiting import resolve_request_cost, ratelimit_script
+from app.common.helpers import ip
+from app import cache
+
+import app.security as security
+import time
+import app
+
+class BootstrapMiddleware:
+    """Prefetches the per-request redis state, so that later middlewares don't need their own roundtrips"""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        request = Request(scope)
+        request.state.bootstrap = await fetch_bootstrap(request)
+        await self.app(scope, receive, send)
+
+async def fetch_bootstrap(request: Request) -> dict:
+    """Fetch the ratelimit counter, website session, csrf token, cached user & permissions.
+    This takes one roundtrip, or two when the user is only known after reading the website session."""
+    ip_address = ip.resolve_ip_address_fastapi(request)
+    redis = request.state.redis_async
+    ratelimit_key = None
+    session_key = None
+    user_id = resolve_token_user_id(request)
+
+    if config.API_RATELIMIT_ENABLED and not ip.is_local_ip(ip_address):
+        ratelimit_key = f'ratelimit:{ip_address}'
+
+    session_id = (
+        request.cookies.get(security.WEBSITE_SESSION_COOKIE_NAME) or
+        request.headers.get('X-Session-ID')
+    )
+
+    if session_id:
+        session_key = security.website_session_key(session_id)
+
+    if not (ratelimit_key or session_key or user_id):
+        return {}
+
+    counter = None
+    website_session = None
+    user_state = None
+
+    async with redis.pipeline(transaction=False) as pipe:
+        if ratelimit_key:
+            await ratelimit_script(
+                keys=[ratelimit_key],
+                args=[config.API_RATELIMIT_WINDOW, resolve_request_cost(request)],
+                client=pipe
+            )
+
+        if session_key:
+            pipe.get(session_key)
+
+        elif user_id:
+            # The user is already known from the token, so fetch its state right away
+            queue_user_state(pipe, user_id)
+
+        results = await pipe.execute()
+
+    if ratelimit_key:
+        counter = results.pop(0)
+
+    if session_key:
+        website_session = results.pop(0)
+
+    elif user_id:
+        user_state = results
+
+    if session_data := security.parse_website_session(website_session):
+        user_id = session_data['user_id']
+
+    if user_id and user_state is None:
+        async with redis.pipeline(transaction=False) as pipe:
+            queue_user_state(pipe, user_id)
+            user_state = await pipe.execute()
+
+    csrf_token, user, permissions = user_state or (None, None, None)
+
+    if user_id:
+        # Let the authentication middleware pick these up from the local cache
+        cache.users.prime(user_id, user, permissions)
+
+    return {
+        'ratelimit': (
+            (int(counter[0]), int(time.time()) + int(counter[1]))
+            if counter else None
+        ),
+        'session_id': session_id,
+        'website_session': session_data,
+        'user_id': user_id,
+        'csrf_token': csrf_token
+    }
+
+def queue_user_state(pipe: Pipeline, user_id: int) -> None:
+    pipe.get(f'csrf:{user_id}')
+    pipe.get(cache.users.user_key(user_id))
+    pipe.get(cache.users.permissions_key(user_id))
+
+def resolve_token_user_id(request: Request) -> int | None:
+    authorization = request.headers.get('Authorization', '')
+    scheme, _, token = authorization.partition(' ')
+
+    if scheme.lower() != 'bearer':
+        return None
+
+    if not (claims := security.validate_token(token)):
+        return None
+
+    return claims['id']
+
+app.api.add_middleware(BootstrapMiddleware)
@@ -0,0 +1,148 @@
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from starlette.routing import BaseRoute, Match
+from starlette.requests import Request
+from email.utils import parsedate_to_datetime
+from typing import List, Tuple
+
+from app.middleware.coalescing import capture_response, replay_response
+from app.cache.responses import CapturedResponse
+from app.common.helpers import ip
+from app.utils import to_utc
+from app.metrics import collector
+from app.session import config
+from app import cache
+
+import app
+
+class ResponseCacheMiddleware:
+    """Serves anonymous GET requests of cached routes from redis, until their tags get purged"""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.routes: List[BaseRoute] | None = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if not (resolved := self.resolve_route(scope)):
+            return await self.app(scope, receive, send)
+
+        route, path_params = resolved
+        headers = dict(scope["headers"])
+
+        if b"x-cache-bypass" in headers and is_local_request(scope):
+            collector.increment('response_cache_bypasses')
+            return await self.app(scope, receive, with_cache_header(send, b"BYPASS"))
+
+        redis = app.session.redis_async
+        digest = cache.responses.request_digest(
+            scope["method"],
+            scope["path"],
+            scope["query_string"]
+        )
+
+        if response := await cache.responses.fetch(digest, redis):
+            collector.increment('response_cache_hits')
+            collector.increment('response_cache_hit_bytes', len(response[2]))
+            return await replay_cached_response(response, headers, send)
+
+        collector.increment('response_cache_misses')
+        response = await capture_response(
+            self.app, scope, receive,
+            with_cache_header(send, b"MISS")
+        )
+
+        if not is_cacheable(response):
+            return
+
+        # Routes can add tags, that are only known after running them
+        tags = [tag.format(**path_params) for tag in route.endpoint.cache_tags]
+        tags.extend(scope.get("state", {}).get("cache_tags", []))
+
+        await cache.responses.store(
+            digest, response, tags,
+            route.endpoint.cache_ttl,
+            redis
+        )
+        collector.increment('response_cache_stored_bytes', len(response[2]))
+
+    def resolve_route(self, scope: Scope) -> Tuple[BaseRoute, dict] | None:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            return None
+
+        if (user := scope.get("user")) and user.is_authenticated:
+            return None
+
+        if self.routes is None:
+            self.routes = [
+                route for route in app.api.routes
+                if getattr(getattr(route, 'endpoint', None), 'cache_ttl', None)
+            ]
+
+        for route in self.routes:
+            match, child_scope = route.matches(scope)
+
+            if match == Match.FULL:
+                return route, child_scope.get("path_params", {})
+
+        return None
+
+def is_local_request(scope: Scope) -> bool:
+    # Only local clients may skip the cache, otherwise anyone could defeat it
+    return ip.is_local_ip(ip.resolve_ip_address_fastapi(Request(scope)))
+
+def is_cacheable(response: CapturedResponse) -> bool:
+    status_code, headers, _ = response
+
+    if status_code != 200:
+        return False
+
+    # Never share responses that set cookies
+    return not any(name.lower() == b"set-cookie" for name, _ in headers)
+
+def with_cache_header(send: Send, value: bytes) -> Send:
+    async def send_wrapper(message: Message) -> None:
+        if message["type"] == "http.response.start":
+            message["headers"] = [*message.get("headers", []), (b"x-cache", value)]
+
+        await send(message)
+
+    return send_wrapper
+
+def find_header(headers: List[Tuple[bytes, bytes]], name: bytes) -> bytes | None:
+    return next((value for key, value in headers if key.lower() == name), None)
+
+def is_not_modified(headers: List[Tuple[bytes, bytes]], request_headers: dict) -> bool:
+    # Same semantics as `utils.is_not_modified`, for the validators of a cached response
+    if (if_none_match := request_headers.get(b"if-none-match")) is not None:
+        # If-None-Match takes precedence over If-Modified-Since
+        etag = find_header(headers, b"etag")
+        tags = [tag.strip().removeprefix(b"W/") for tag in if_none_match.split(b",")]
+        return etag is not None and (etag in tags or b"*" in tags)
+
+    if (last_modified := find_header(headers, b"last-modified")) is None:
+        return False
+
+    if not (if_modified_since := request_headers.get(b"if-modified-since")):
+        return False
+
+    try:
+        since = parsedate_to_datetime(if_modified_since.decode('latin-1'))
+        modified = parsedate_to_datetime(last_modified.decode('latin-1'))
+    except (TypeError, ValueError):
+        return False
+
+    return to_utc(modified) <= to_utc(since)
+
+async def replay_cached_response(response: CapturedResponse, request_headers: dict, send: Send) -> None:
+    status_code, headers, body = response
+    headers = [*headers, (b"x-cache", b"HIT")]
+
+    if is_not_modified(headers, request_headers):
+        # The client's copy is still up-to-date
+        headers = [(name, value) for name, value in headers if name.lower() != b"content-length"]
+        return await replay_response((304, headers, b""), send)
+
+    await replay_response((status_code, headers, body), send)
+
+if config.API_RESPONSE_CACHE:
+    app.api.add_middleware(ResponseCacheMiddleware)
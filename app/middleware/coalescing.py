@@ -0,0 +1,150 @@
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from starlette.routing import BaseRoute, Match
+from typing import Dict, List
+from redis.asyncio import Redis
+
+from app.cache.responses import CapturedResponse, request_digest, serialize_response, deserialize_response
+from app.metrics import collector
+from app.session import config
+
+import asyncio
+import app
+
+class CoalescingMiddleware:
+    """Lets identical concurrent anonymous GET requests share one in-flight response"""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.pending: Dict[str, asyncio.Future] = {}
+        self.routes: List[BaseRoute] | None = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if not self.is_coalescable(scope):
+            return await self.app(scope, receive, send)
+
+        key = resolve_request_key(scope)
+
+        if future := self.pending.get(key):
+            # Another request is already computing this response
+            collector.increment('coalesced_requests')
+            response = await asyncio.shield(future)
+
+            if response is not None:
+                return await replay_response(response, send)
+
+            # The leading request failed, fall back to our own computation
+            return await self.app(scope, receive, send)
+
+        future = asyncio.get_running_loop().create_future()
+        self.pending[key] = future
+
+        try:
+            if config.API_REQUEST_COALESCING_DISTRIBUTED:
+                response = await self.coalesce_distributed(key, scope, receive, send)
+            else:
+                response = await capture_response(self.app, scope, receive, send)
+
+            future.set_result(response)
+        finally:
+            if not future.done():
+                future.set_result(None)
+
+            self.pending.pop(key, None)
+
+    async def coalesce_distributed(
+        self,
+        key: str,
+        scope: Scope,
+        receive: Receive,
+        send: Send
+    ) -> CapturedResponse:
+        redis: Redis = app.session.redis_async
+        lock_key = f'coalescing:lock:{key}'
+        result_key = f'coalescing:result:{key}'
+        timeout = config.API_REQUEST_COALESCING_TIMEOUT * 1000
+
+        if await redis.set(lock_key, 1, nx=True, px=timeout):
+            try:
+                response = await capture_response(self.app, scope, receive, send)
+                await redis.set(result_key, serialize_response(response), px=1000)
+                return response
+            finally:
+                await redis.delete(lock_key)
+
+        # Another worker is computing this response, wait for it to show up
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + config.API_REQUEST_COALESCING_TIMEOUT
+
+        while loop.time() < deadline:
+            if result := await redis.get(result_key):
+                collector.increment('coalesced_requests')
+                response = deserialize_response(result)
+                await replay_response(response, send)
+                return response
+
+            if not await redis.exists(lock_key):
+                break
+
+            await asyncio.sleep(0.025)
+
+        return await capture_response(self.app, scope, receive, send)
+
+    def is_coalescable(self, scope: Scope) -> bool:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            return False
+
+        if (user := scope.get("user")) and user.is_authenticated:
+            return False
+
+        if self.routes is None:
+            self.routes = [
+                route for route in app.api.routes
+                if getattr(getattr(route, 'endpoint', None), 'coalesced', False)
+            ]
+
+        return any(
+            route.matches(scope)[0] == Match.FULL
+            for route in self.routes
+        )
+
+async def capture_response(app: ASGIApp, scope: Scope, receive: Receive, send: Send) -> CapturedResponse:
+    """Run the request & forward the response, while keeping a copy of it"""
+    status_code = 500
+    headers = []
+    body = bytearray()
+
+    async def send_wrapper(message: Message) -> None:
+        nonlocal status_code, headers
+
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+            headers = list(message.get("headers", []))
+
+        elif message["type"] == "http.response.body":
+            body.extend(message.get("body", b""))
+
+        await send(message)
+
+    await app(scope, receive, send_wrapper)
+    return status_code, headers, bytes(body)
+
+async def replay_response(response: CapturedResponse, send: Send) -> None:
+    status_code, headers, body = response
+    await send({"type": "http.response.start", "status": status_code, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+def resolve_request_key(scope: Scope) -> str:
+    # Conditional requests may be answered differently
+    headers = dict(scope["headers"])
+
+    return request_digest(
+        scope["method"],
+        scope["path"],
+        scope["query_string"],
+        headers.get(b"if-none-match", b"").decode("latin-1"),
+        headers.get(b"if-modified-since", b"").decode("latin-1")
+    )
+
+if config.API_REQUEST_COALESCING:
+    app.api.add_middleware(CoalescingMiddleware)
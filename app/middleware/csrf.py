@@ -31,8 +31,14 @@ async def is_valid_token(request: Request) -> bool:
     if not (csrf_token := request.headers.get("x-csrf-token")):
         return False
 
-    redis: Redis = request.state.redis_async
-    stored_token = await redis.get(f"csrf:{request.user.id}")
+    bootstrap = getattr(request.state, 'bootstrap', {})
+
+    if bootstrap.get('user_id') == request.user.id:
+        # The token was already fetched at the start of the request
+        stored_token = bootstrap['csrf_token']
+    else:
+        redis: Redis = request.state.redis_async
+        stored_token = await redis.get(f"csrf:{request.user.id}")
 
     if not stored_token:
         return False
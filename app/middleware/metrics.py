@@ -1,24 +1,56 @@
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
-from starlette.requests import Request
-from typing import Callable
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.metrics import collector
 
 import time
 import app
 
-class MetricsMiddleware(BaseHTTPMiddleware):
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable,
-    ) -> Response:
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
         start_time = time.perf_counter_ns()
-        response = await call_next(request)
-        end_time = time.perf_counter_ns()
+        status_code = 500
+        response_size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, response_size
+
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                time_elapsed = time.perf_counter_ns() - start_time
+                headers = list(message.get("headers", []))
+                headers.append((b"process-time", str(time_elapsed / 1e6).encode()))
+                message["headers"] = headers
+
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+
+            await send(message)
+
+        collector.in_flight += 1
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            collector.in_flight -= 1
+            collector.observe(
+                scope["method"],
+                resolve_route(scope),
+                status_code,
+                (time.perf_counter_ns() - start_time) / 1e9,
+                response_size
+            )
+
+def resolve_route(scope: Scope) -> str:
+    # Use the path template, to keep the amount of label values bounded
+    if route := scope.get("route"):
+        return getattr(route, "path", "unmatched")
 
-        time_elapsed = end_time - start_time
-        response.headers["process-time"] = str(round(time_elapsed) / 1e6)
-        return response
+    return "unmatched"
 
 app.api.add_middleware(MetricsMiddleware)
@@ -1,7 +1,8 @@
 
 from fastapi.responses import JSONResponse
 from fastapi import Request, Response
-from typing import Callable, Tuple
+from typing import Callable, List, Tuple
+from starlette.routing import BaseRoute, Match
 from redis.asyncio import Redis
 
 from app.common.config import config_instance as config
@@ -13,6 +14,25 @@ from app import utils
 import time
 import app
 
+# Increments the counter by the request cost, sets up the window if required and
+# returns the counter value together with the remaining window ttl
+RATELIMIT_SCRIPT = """
+local current = redis.call('INCRBY', KEYS[1], ARGV[2])
+local ttl = redis.call('TTL', KEYS[1])
+
+if ttl < 0 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+    ttl = tonumber(ARGV[1])
+end
+
+return {current, ttl}
+"""
+
+ratelimit_script = app.session.redis_async.register_script(RATELIMIT_SCRIPT)
+
+# Routes that declare a cost other than 1, resolved on the first request
+weighted_routes: List[Tuple[BaseRoute, int]] | None = None
+
 async def ratelimit_middleware(request: Request, call_next: Callable) -> Response:
     ip_address = ip.resolve_ip_address_fastapi(request)
     request.state.is_local_ip = ip.is_local_ip(ip_address)
@@ -23,26 +43,16 @@ async def ratelimit_middleware(request: Request, call_next: Callable) -> Respons
 
     redis: Redis = request.state.redis_async
     counter_key = f'ratelimit:{ip_address}'
-    ttl_key = f'ratelimit:{ip_address}:ttl'
 
     # Get ratelimit configuration based on auth scopes
     window, limit = resolve_ratelimit_configuration(request)
+    bootstrap = getattr(request.state, 'bootstrap', {})
 
-    # Increment request count
-    current = await redis.incr(counter_key)
-    current_time = int(time.time())
-
-    if current == 1:
-        # First request in this window, set expiration and store reset time
-        await redis.expire(counter_key, window)
-        await redis.setex(ttl_key, window, current_time + window)
-
-    reset_time = int(await redis.get(ttl_key) or b'0')
+    if (counter := bootstrap.get('ratelimit')) is None:
+        # Increment request count & resolve the window in a single roundtrip
+        counter = await increment_counter(redis, counter_key, window, resolve_request_cost(request))
 
-    if not reset_time:
-        # Fallback if ttl key is missing
-        reset_time = current_time + window
-        await redis.setex(ttl_key, window, reset_time)
+    current, reset_time = counter
 
     # Calculate remaining requests & check if rate limit is exceeded
     remaining = max(0, limit - current)
@@ -65,6 +75,15 @@ async def ratelimit_middleware(request: Request, call_next: Callable) -> Respons
     response.headers['X-RateLimit-Reset'] = str(reset_time)
     return response
 
+async def increment_counter(redis: Redis, key: str, window: int, cost: int = 1) -> Tuple[int, int]:
+    """Increment the request counter and return the current count & reset timestamp"""
+    current, ttl = await ratelimit_script(
+        keys=[key],
+        args=[window, cost],
+        client=redis
+    )
+    return int(current), int(time.time()) + int(ttl)
+
 def resolve_ratelimit_configuration(request: Request) -> Tuple[int, int]:
     if "admin" in request.auth.scopes:
         return (
@@ -83,6 +102,25 @@ def resolve_ratelimit_configuration(request: Request) -> Tuple[int, int]:
         config.API_RATELIMIT_REGULAR
     )
 
+def resolve_request_cost(request: Request) -> int:
+    """Resolve the amount of units a request takes from the ratelimit budget"""
+    global weighted_routes
+
+    if weighted_routes is None:
+        weighted_routes = [
+            (route, route.endpoint.ratelimit_cost)
+            for route in app.api.routes
+            if getattr(getattr(route, 'endpoint', None), 'ratelimit_cost', 1) != 1
+        ]
+
+    for route, cost in weighted_routes:
+        match, _ = route.matches(request.scope)
+
+        if match == Match.FULL:
+            return cost
+
+    return 1
+
 def error_response(
     status_code: int,
     detail: str,
@@ -1,7 +1,37 @@
 
 from starlette.types import ASGIApp, Receive, Scope, Send
+from sqlalchemy.orm import Session
+from contextlib import ExitStack
 from app import api, session
 
+class LazySession:
+    """Database session proxy, that only checks out a connection once it gets used"""
+
+    def __init__(self) -> None:
+        self.stack = ExitStack()
+        self.session: Session | None = None
+
+    def __enter__(self) -> "LazySession":
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        return self.stack.__exit__(*exc_info)
+
+    def __getattr__(self, name: str):
+        return getattr(self.resolve(), name)
+
+    @property
+    def is_open(self) -> bool:
+        return self.session is not None
+
+    def resolve(self) -> Session:
+        if self.session is None:
+            self.session = self.stack.enter_context(
+                session.database.managed_session()
+            )
+
+        return self.session
+
 class StateMiddleware:
     def __init__(self, app: ASGIApp):
         self.app = app
@@ -10,7 +40,7 @@ class StateMiddleware:
         if scope["type"] not in ("http", "websocket"):
             return await self.app(scope, receive, send)
 
-        with session.database.managed_session() as database_session:
+        with LazySession() as database_session:
             state = scope.setdefault("state", {})
             state["db"] = database_session
             state["redis"] = session.redis
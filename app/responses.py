@@ -0,0 +1,29 @@
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from typing import Any
+
+import pydantic_core
+import orjson
+
+class ORJSONResponse(JSONResponse):
+    """JSON response, which serializes pydantic models directly to bytes & everything else using orjson"""
+
+    def render(self, content: Any) -> bytes:
+        if is_model_content(content):
+            # Serialize validated models in a single step, skipping jsonable_encoder
+            return pydantic_core.to_json(content)
+
+        return orjson.dumps(
+            content,
+            option=orjson.OPT_NON_STR_KEYS
+        )
+
+def is_model_content(content: Any) -> bool:
+    if isinstance(content, BaseModel):
+        return True
+
+    if isinstance(content, (list, tuple)) and content:
+        return isinstance(content[0], BaseModel)
+
+    return False
@@ -8,6 +8,7 @@ from . import resources
 from . import rankings
 from . import beatmaps
 from . import support
+from . import metrics
 from . import account
 from . import releases
 from . import groups
@@ -21,6 +22,7 @@ from . import chat
 
 router = APIRouter(responses={500: {"description": "Internal Server Error"}})
 router.include_router(stats.router)
+router.include_router(metrics.router)
 router.include_router(chat.router, prefix="/chat", tags=["chat"])
 router.include_router(forum.router, prefix="/forum", tags=["forum"])
 router.include_router(oauth.router, prefix="/oauth", tags=["oauth"])
@@ -4,6 +4,7 @@ from app.common.database import relationships, users
 from app.common.constants import UserActivity
 from app.common.helpers import activity
 from app.security import require_login
+from app.cache import cards
 from app.utils import requires
 
 from fastapi import HTTPException, APIRouter, Request
@@ -28,12 +29,17 @@ remove_responses = {
 @requires("users.friends.view")
 def friends(request: Request):
     """Get a list of friends for the authenticated user"""
-    return [
-        UserModelCompact.model_validate(friend.target, from_attributes=True)
+    friend_ids = [
+        friend.target_id
         for friend in relationships.fetch_many_by_id(request.user.id, request.state.db)
         if friend.status == 0
     ]
 
+    return [
+        UserModelCompact.model_validate(card, from_attributes=True)
+        for card in cards.fetch_many(friend_ids, request.state.db)
+    ]
+
 @router.post("/friends", response_model=RelationshipResponse, responses=add_responses)
 @requires("users.friends.create")
 def add_friend(request: Request, id: int):
@@ -3,6 +3,7 @@ from fastapi import HTTPException, APIRouter, Request
 from app.common.database.repositories import users
 from app.utils import requires, random_string
 from app.models import IrcTokenResponse
+from app import cache
 
 router = APIRouter()
 
@@ -24,6 +25,7 @@ def regenerate_irc_token(request: Request) -> IrcTokenResponse:
         {'irc_token': request.user.irc_token},
         session=request.state.db
     )
+    cache.users.invalidate(request.user.id)
 
     return IrcTokenResponse(
         username=request.user.name.replace(' ', '_'),
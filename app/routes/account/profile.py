@@ -5,6 +5,7 @@ from app.common.constants.regexes import DISCORD_USERNAME, URL
 from app.security import require_login
 from app.common.database import users
 from app.utils import requires
+from app import cache
 
 import re
 
@@ -53,6 +54,7 @@ def profile_update(
         },
         request.state.db
     )
+    cache.users.invalidate(request.user.id)
 
     return UserModel.model_validate(
         users.fetch_by_id(request.user.id, session=request.state.db),
@@ -8,6 +8,7 @@ from app.common.constants.regexes import USERNAME, EMAIL
 from app.common.constants.strings import BAD_WORDS
 from app.common.helpers import ip, location
 from app.common import officer, mail
+from app.utils import run_blocking
 from app.models import (
     VerificationResponse,
     RegistrationRequest,
@@ -235,4 +236,8 @@ def hashed_password(password: str) -> str:
         .hexdigest() \
         .encode()
 
+    # Hashing shares the bcrypt pool with logins, so that registrations can't starve other work
+    return run_blocking(bcrypt_hash, md5_hash, executor='bcrypt')
+
+def bcrypt_hash(md5_hash: bytes) -> str:
     return bcrypt.hashpw(md5_hash, bcrypt.gensalt()).decode()
@@ -2,6 +2,8 @@
 from fastapi import HTTPException, APIRouter, Request
 from app.models import BeatmapModelWithCollaborations, ErrorResponse
 from app.common.database import beatmaps
+from sqlalchemy.orm import Session
+from app.utils import add_cache_tags, cached, coalesced, conditional, validated_response
 
 router = APIRouter(
     responses={
@@ -10,8 +12,17 @@ router = APIRouter(
 )
 
 @router.get("/{id}", response_model=BeatmapModelWithCollaborations)
+@cached(60, 'beatmap:{id}')
+@coalesced
+@conditional
+@validated_response
 def get_beatmap(request: Request, id: int) -> BeatmapModelWithCollaborations:
-    if not (beatmap := beatmaps.fetch_by_id(id, request.state.db)):
+    beatmap = resolve_beatmap(request.state.db, id)
+    add_cache_tags(request, f'beatmapset:{beatmap.set_id}')
+    return beatmap
+
+def resolve_beatmap(session: Session, id: int) -> BeatmapModelWithCollaborations:
+    if not (beatmap := beatmaps.fetch_by_id(id, session)):
         raise HTTPException(
             status_code=404,
             detail="The requested beatmap could not be found"
@@ -1,11 +1,13 @@
 
 from fastapi import APIRouter, HTTPException, Request, Query
+from sqlalchemy.orm import Session
 from contextlib import suppress
 
 from app.common.config import config_instance as config
 from app.common.database import scores, beatmaps
 from app.common.constants import GameMode
 from app.models import *
+from app.utils import coalesced, validated_response
 
 router = APIRouter(
     responses={
@@ -19,13 +21,27 @@ user_responses = {
 }
 
 @router.get("/{id}/scores", response_model=ScoreCollectionResponseWithoutBeatmap)
+@coalesced
+@validated_response
 def get_beatmap_scores(
     request: Request, id: int,
     offset: int = Query(0, ge=0),
     mods: str | None = Query(None),
     mode: GameMode | None = Query(None)
 ) -> ScoreCollectionResponseWithoutBeatmap:
-    if not (beatmap := beatmaps.fetch_by_id(id, request.state.db)):
+    return resolve_beatmap_scores(
+        request.state.db,
+        id, offset, mods, mode
+    )
+
+def resolve_beatmap_scores(
+    session: Session,
+    id: int,
+    offset: int,
+    mods: str | None,
+    mode: GameMode | None
+) -> ScoreCollectionResponseWithoutBeatmap:
+    if not (beatmap := beatmaps.fetch_by_id(id, session)):
         raise HTTPException(
             status_code=404,
             detail="The requested beatmap could not be found"
@@ -45,12 +61,12 @@ def get_beatmap_scores(
         top_scores = scores.fetch_range_scores_mods(
             id, mode_enum.value, resolved_mods.value,
             offset=offset, limit=config.SCORE_RESPONSE_LIMIT,
-            session=request.state.db
+            session=session
         )
         score_count = scores.fetch_count_beatmap(
             beatmap.id,
             mode_enum.value, resolved_mods.value,
-            session=request.state.db
+            session=session
         )
 
     else:
@@ -58,12 +74,12 @@ def get_beatmap_scores(
             id, mode_enum.value,
             offset=offset,
             limit=config.SCORE_RESPONSE_LIMIT,
-            session=request.state.db
+            session=session
         )
         score_count = scores.fetch_count_beatmap(
             beatmap.id,
             mode_enum.value,
-            session=request.state.db
+            session=session
         )
 
     return ScoreCollectionResponseWithoutBeatmap(
@@ -75,6 +91,7 @@ def get_beatmap_scores(
     )
 
 @router.get("/{beatmap_id}/scores/users/{user_id}", response_model=ScoreCollectionResponseWithoutBeatmap, responses=user_responses)
+@validated_response
 def get_beatmap_user_scores(
     request: Request,
     beatmap_id: int,
@@ -3,9 +3,9 @@ from fastapi import HTTPException, APIRouter, Request, Body
 from app.models import BeatmapUpdateRequest, BeatmapsetModel, ErrorResponse
 from app.common.constants import BeatmapGenre, BeatmapLanguage
 from app.common.database import beatmapsets
-from app.common.helpers import permissions
+from sqlalchemy.orm import Session
 from app.security import require_login
-from app.utils import requires
+from app.utils import requires, has_permission, cached, coalesced, conditional, purges, validated_response
 
 router = APIRouter(
     responses={
@@ -14,8 +14,15 @@ router = APIRouter(
 )
 
 @router.get("/{set_id}", response_model=BeatmapsetModel)
+@cached(60, 'beatmapset:{set_id}')
+@coalesced
+@conditional
+@validated_response
 def get_beatmapset(request: Request, set_id: int) -> BeatmapsetModel:
-    if not (beatmapset := beatmapsets.fetch_one(set_id, request.state.db)):
+    return resolve_beatmapset(request.state.db, set_id)
+
+def resolve_beatmapset(session: Session, set_id: int) -> BeatmapsetModel:
+    if not (beatmapset := beatmapsets.fetch_one(set_id, session)):
         raise HTTPException(
             status_code=404,
             detail="The requested beatmapset could not be found"
@@ -30,6 +37,7 @@ def get_beatmapset(request: Request, set_id: int) -> BeatmapsetModel:
     return BeatmapsetModel.model_validate(beatmapset, from_attributes=True)
 
 @router.patch("/{set_id}", response_model=BeatmapsetModel, dependencies=[require_login])
+@purges('beatmapset:{set_id}')
 def update_beatmapset_metadata(
     request: Request,
     set_id: int,
@@ -41,9 +49,9 @@ def update_beatmapset_metadata(
             detail="The requested beatmapset could not be found"
         )
 
-    full_permission = permissions.has_permission(
+    full_permission = has_permission(
         "beatmaps.metadata.update",
-        request.user.id
+        request
     )
 
     if not full_permission and beatmapset.creator_id != request.user.id:
@@ -5,11 +5,10 @@ from typing import List
 
 from app.models import KudosuModel, KudosuWithoutSetModel, ErrorResponse
 from app.common.database import beatmapsets, modding, posts
-from app.common.helpers import permissions
 from app.common.constants import BeatmapStatus
 from app.common.cache import leaderboards
 from app.security import require_login
-from app.utils import requires
+from app.utils import requires, has_permission
 
 router = APIRouter(
     responses={
@@ -81,9 +80,9 @@ def reward_kudosu(request: Request, set_id: int, post_id: int):
             detail="This beatmapset is not linked to a forum topic"
         )
 
-    can_force_reward = permissions.has_permission(
+    can_force_reward = has_permission(
         "forum.kudosu.force_reward",
-        request.user.id
+        request
     )
 
     is_authorized = (
@@ -192,9 +191,9 @@ def revoke_kudosu(request: Request, set_id: int, post_id: int):
             detail="This beatmapset is not linked to a forum topic"
         )
 
-    can_force_reward = permissions.has_permission(
+    can_force_reward = has_permission(
         "forum.kudosu.force_reward",
-        request.user.id
+        request
     )
 
     if beatmapset.status >= BeatmapStatus.Ranked and not can_force_reward:
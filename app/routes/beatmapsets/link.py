@@ -1,9 +1,8 @@
 
 from fastapi import HTTPException, APIRouter, Request, Body
 from app.common.database import beatmapsets, users, topics
-from app.common.helpers import permissions
 from app.security import require_login
-from app.utils import requires
+from app.utils import requires, has_permission, purges
 from app.models import *
 
 router = APIRouter(
@@ -16,6 +15,7 @@ router = APIRouter(
 )
 
 @router.patch('/{beatmapset_id}/link', response_model=BeatmapsetModel)
+@purges('beatmapset:{beatmapset_id}')
 @requires('beatmaps.link')
 def link_beatmapset_to_topic(
     request: Request,
@@ -28,9 +28,9 @@ def link_beatmapset_to_topic(
     if not (topic := topics.fetch_one(link_request.topic_id, request.state.db)):
         raise HTTPException(404, 'The specified topic could not be found')
 
-    can_force_update = permissions.has_permission(
+    can_force_update = has_permission(
         'beatmaps.moderation.force_link',
-        request.user.id
+        request
     )
 
     if beatmapset.server != 0 and not can_force_update:
@@ -63,6 +63,7 @@ def link_beatmapset_to_topic(
     )
 
 @router.delete('/{beatmapset_id}/link', response_model=BeatmapsetModel)
+@purges('beatmapset:{beatmapset_id}')
 @requires('beatmaps.link')
 def unlink_beatmapset_from_topic(request: Request, beatmapset_id: int) -> BeatmapsetModel:
     if not (beatmapset := beatmapsets.fetch_one(beatmapset_id, request.state.db)):
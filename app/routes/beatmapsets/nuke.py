@@ -9,7 +9,7 @@ from app.models import BeatmapsetModel, ErrorResponse
 from app.common.database import DBUser, DBBeatmapset
 from app.common.helpers import activity
 from app.security import require_login
-from app.utils import requires
+from app.utils import requires, purges
 
 router = APIRouter(
     dependencies=[require_login],
@@ -21,6 +21,7 @@ router = APIRouter(
 )
 
 @router.post("/{set_id}/nuke", response_model=BeatmapsetModel)
+@purges('beatmapset:{set_id}')
 @requires("beatmaps.nuke")
 def nuke_beatmap(request: Request, set_id: int):
     if not (beatmapset := beatmapsets.fetch_one(set_id, request.state.db)):
@@ -2,7 +2,7 @@
 from fastapi import HTTPException, APIRouter, Request, Body
 from app.common.database import beatmapsets, users
 from app.security import require_login
-from app.utils import requires
+from app.utils import requires, purges
 from app.models import *
 
 router = APIRouter(
@@ -15,6 +15,7 @@ router = APIRouter(
 )
 
 @router.patch("/{set_id}/owner", response_model=BeatmapsetModel)
+@purges('beatmapset:{set_id}')
 @requires("beatmaps.moderation.owner")
 def change_beatmap_owner(
     request: Request,
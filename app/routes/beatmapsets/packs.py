@@ -1,6 +1,8 @@
 
 from app.models import ErrorResponse, BeatmapPackModel, BeatmapPackWithEntriesModel
 from app.common.database import packs
+from app.cache import reference
+from app.utils import conditional
 
 from fastapi import HTTPException, APIRouter, Request
 from fastapi.responses import RedirectResponse
@@ -14,13 +16,12 @@ pack_responses = {
 }
 
 @router.get("/packs", response_model=List[BeatmapPackModel])
+@conditional
 def get_beatmap_packs(request: Request):
-    return [
-        BeatmapPackModel.model_validate(pack, from_attributes=True)
-        for pack in packs.fetch_all(request.state.db)
-    ]
+    return reference.fetch('packs', request.state.db)
 
 @router.get("/packs/{category}", response_model=List[BeatmapPackModel])
+@conditional
 def get_beatmap_packs_by_category(request: Request, category: str):
     return [
         BeatmapPackModel.model_validate(pack, from_attributes=True)
@@ -28,6 +29,7 @@ def get_beatmap_packs_by_category(request: Request, category: str):
     ]
 
 @router.get("/packs/{category}/{pack_id}", response_model=BeatmapPackWithEntriesModel, responses=pack_responses)
+@conditional
 def get_beatmap_pack(request: Request, category: str, pack_id: int):
     if not (pack := packs.fetch_one(pack_id, request.state.db)):
         raise HTTPException(
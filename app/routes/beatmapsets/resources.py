@@ -3,7 +3,7 @@ from fastapi import HTTPException, APIRouter, Request, Query
 from fastapi.responses import StreamingResponse, Response
 from app.common.database import beatmapsets
 from app.security import require_login
-from app.utils import requires
+from app.utils import requires, ratelimit_cost, conditional, check_preconditions, entity_tag
 
 router = APIRouter(
     responses={
@@ -14,7 +14,9 @@ router = APIRouter(
 )
 
 @router.get("/{set_id}/osz", dependencies=[require_login], response_class=StreamingResponse)
+@conditional
 @requires("beatmaps.download")
+@ratelimit_cost(10)
 def get_osz(request: Request, set_id: int, no_video: bool = Query(False)) -> StreamingResponse:
     if not (beatmapset := beatmapsets.fetch_one(set_id, request.state.db)):
         raise HTTPException(status_code=404)
@@ -22,6 +24,13 @@ def get_osz(request: Request, set_id: int, no_video: bool = Query(False)) -> Str
     if not beatmapset.available:
         raise HTTPException(status_code=451)
 
+    # The osz file only changes, when the beatmapset gets updated
+    check_preconditions(
+        request,
+        etag=entity_tag(set_id, beatmapset.last_update, no_video),
+        last_modified=beatmapset.last_update
+    )
+
     response, size = request.state.beatmaps.osz(set_id, no_video)
 
     if not response:
@@ -32,8 +41,7 @@ def get_osz(request: Request, set_id: int, no_video: bool = Query(False)) -> Str
         media_type='application/octet-stream',
         headers={
             'Content-Length': str(size),
-            'Content-Disposition': f'attachment; filename="{set_id} {beatmapset.artist} - {beatmapset.title}.osz"',
-            'Last-Modified': beatmapset.last_update.strftime('%a, %d %b %Y %H:%M:%S GMT')
+            'Content-Disposition': f'attachment; filename="{set_id} {beatmapset.artist} - {beatmapset.title}.osz"'
         }
     )
 
@@ -2,11 +2,14 @@
 from app.common.database.repositories import beatmapsets
 from app.models import SearchRequest, BeatmapsetModel
 from fastapi import APIRouter, Request
+from app.utils import ratelimit_cost, validated_response
 from typing import List
 
 router = APIRouter()
 
 @router.post("/search", response_model=List[BeatmapsetModel])
+@ratelimit_cost(5)
+@validated_response
 def search_beatmapsets(request: Request, query: SearchRequest):
     user_id = (
         request.user.id
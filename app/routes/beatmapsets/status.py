@@ -13,9 +13,9 @@ from app.common.constants import BeatmapStatus, NotificationType, UserActivity
 from app.common.config import config_instance as config
 from app.models import BeatmapsetModel, ErrorResponse
 from app.common.database import DBBeatmapset, DBUser
-from app.common.helpers import activity, permissions
+from app.common.helpers import activity
 from app.security import require_login
-from app.utils import requires
+from app.utils import requires, has_permission, purges
 from app.common.database import (
     notifications,
     nominations,
@@ -36,6 +36,7 @@ router = APIRouter(
 )
 
 @router.patch("/{set_id}/status", response_model=BeatmapsetModel)
+@purges('beatmapset:{set_id}')
 @requires("beatmaps.update_status")
 def update_beatmapset_status(
     request: Request,
@@ -64,6 +65,7 @@ def update_beatmapset_status(
     return handler(beatmapset, request)
 
 @router.patch("/{set_id}/status/beatmaps", response_model=BeatmapsetModel)
+@purges('beatmapset:{set_id}')
 @requires("beatmaps.update_status")
 def update_beatmap_statuses(
     request: Request,
@@ -267,9 +269,9 @@ def handle_approved_status(beatmapset: DBBeatmapset, request: Request) -> Beatma
             detail="This beatmap does not have enough nominations."
         )
 
-    is_allowed = permissions.has_permission(
+    is_allowed = has_permission(
         "beatmaps.moderation.force_approved",
-        request.user.id,
+        request
     )
 
     if not is_allowed:
@@ -18,8 +18,9 @@ logger = logging.getLogger("ws")
 async def event_websocket(websocket: WebSocket):
     await websocket.accept()
 
-    # Close existing unused database session
-    websocket.state.db.close()
+    # Release the database connection, in case authentication used one
+    if websocket.state.db.is_open:
+        websocket.state.db.close()
 
     try:
         pubsub = app.session.redis_async.pubsub()
@@ -2,6 +2,8 @@
 from fastapi import HTTPException, APIRouter, Request
 from app.models import ForumModel, ErrorResponse
 from app.common.database import forums
+from app.cache import reference
+from app.utils import conditional
 
 router = APIRouter(
     responses={404: {"description": "Forum not found", "model": ErrorResponse}}
@@ -9,12 +11,10 @@ router = APIRouter(
 
 @router.get("/", response_model=list[ForumModel])
 def get_main_forums(request: Request):
-    return [
-        ForumModel.model_validate(forum, from_attributes=True)
-        for forum in forums.fetch_main_forums(request.state.db)
-    ]
+    return reference.fetch('forums', request.state.db)
 
 @router.get("/{forum_id}", response_model=ForumModel)
+@conditional
 def get_forum(request: Request, forum_id: int):
     if not (forum := forums.fetch_by_id(forum_id, request.state.db)):
         raise HTTPException(404, "The requested forum could not be found")
@@ -7,11 +7,15 @@ from typing import List
 
 from app.common.database.objects import DBForumPost, DBForumTopic, DBBeatmapset, DBUser
 from app.common.database import topics, posts, notifications, nominations, beatmapsets
-from app.models import PostModel, ErrorResponse, PostCreateRequest, PostUpdateRequest, ForumHideRequest, DraftCreateRequest
+from app.models import PostModel, UserModelCompact, ErrorResponse, PostCreateRequest, PostUpdateRequest, ForumHideRequest, DraftCreateRequest
 from app.common.constants import NotificationType, BeatmapStatus, UserActivity
-from app.common.helpers import activity, permissions
+from app.common.helpers import activity
 from app.security import require_login
-from app.utils import requires
+from app.cache import cards
+from app.utils import requires, has_permission, cached, purges, validated_response
+
+# Fields of the post model, that are read from the post itself
+POST_FIELDS = [field for field in PostModel.model_fields if field != 'user']
 
 router = APIRouter(
     responses={
@@ -46,6 +50,7 @@ def get_post(
     return PostModel.model_validate(post, from_attributes=True)
 
 @router.delete("/{forum_id}/topics/{topic_id}/posts/{post_id}", dependencies=[require_login])
+@purges('forum:{forum_id}', 'topic:{topic_id}')
 @requires("forum.posts.delete")
 def delete_post(
     request: Request,
@@ -59,9 +64,9 @@ def delete_post(
     if post.hidden:
         raise HTTPException(404, "The requested post could not be found")
 
-    can_force_delete = permissions.has_permission(
+    can_force_delete = has_permission(
         "forum.moderation.posts.delete",
-        request.user.id
+        request
     )
 
     if post.user_id != request.user.id and not can_force_delete:
@@ -79,6 +84,8 @@ def delete_post(
     return {}
 
 @router.get("/{forum_id}/topics/{topic_id}/posts", response_model=List[PostModel])
+@cached(30, 'topic:{topic_id}')
+@validated_response
 def get_topic_posts(
     request: Request,
     forum_id: int,
@@ -102,13 +109,28 @@ def get_topic_posts(
         session=request.state.db
     )
 
+    return post_models(
+        [post for post in topic_posts if not post.hidden],
+        request.state.db
+    )
+
+def post_models(topic_posts: List[DBForumPost], session: Session) -> List[PostModel]:
+    # Resolve the authors from their cached cards, instead of loading each one
+    authors = {
+        card.id: UserModelCompact.model_validate(card, from_attributes=True)
+        for card in cards.fetch_many((post.user_id for post in topic_posts), session)
+    }
+
     return [
-        PostModel.model_validate(post, from_attributes=True)
+        PostModel.model_validate({
+            **{field: getattr(post, field) for field in POST_FIELDS},
+            'user': authors[post.user_id]
+        })
         for post in topic_posts
-        if not post.hidden
     ]
 
 @router.post("/{forum_id}/topics/{topic_id}/posts", response_model=PostModel, dependencies=[require_login])
+@purges('forum:{forum_id}', 'topic:{topic_id}')
 @requires("forum.posts.create")
 def create_post(
     request: Request,
@@ -246,6 +268,7 @@ def create_draft(
     return PostModel.model_validate(draft, from_attributes=True)
 
 @router.patch("/{forum_id}/topics/{topic_id}/posts/{post_id}", response_model=PostModel, dependencies=[require_login])
+@purges('forum:{forum_id}', 'topic:{topic_id}')
 @requires("forum.posts.edit")
 def edit_post(
     request: Request,
@@ -267,17 +290,17 @@ def edit_post(
     if post.topic_id != topic_id or post.forum_id != forum_id:
         return RedirectResponse(f"/forum/{post.forum_id}/topics/{post.topic_id}/posts/{post.id}")
 
-    can_bypass_lock = permissions.has_permission(
+    can_bypass_lock = has_permission(
         "forum.moderation.posts.bypass_lock",
-        request.user.id
+        request
     )
-    can_create_locks = permissions.has_permission(
+    can_create_locks = has_permission(
         "forum.moderation.posts.lock",
-        request.user.id
+        request
     )
-    can_edit_others = permissions.has_permission(
+    can_edit_others = has_permission(
         "forum.moderation.posts.edit",
-        request.user.id
+        request
     )
 
     if post.edit_locked and not can_bypass_lock:
@@ -317,6 +340,7 @@ def edit_post(
     return PostModel.model_validate(post, from_attributes=True)
 
 @router.patch("/{forum_id}/topics/{topic_id}/posts/{post_id}/hide", response_model=PostModel, dependencies=[require_login])
+@purges('forum:{forum_id}', 'topic:{topic_id}')
 @requires("forum.moderation.posts.hide")
 def hide_post(
     request: Request,
@@ -404,12 +428,12 @@ def resolve_icon(data: PostCreateRequest, request: Request, topic: DBForumTopic)
         return
 
     can_change_icon = (
-        permissions.has_permission("forum.topics.edit_icon", request.user.id) and
+        has_permission("forum.topics.edit_icon", request) and
         topic.can_change_icon
     )
-    can_force_change_icon = permissions.has_permission(
+    can_force_change_icon = has_permission(
         "forum.moderation.topics.edit_icon",
-        request.user.id
+        request
     )
 
     # BATs are able to change icons of topics that allow icon changes
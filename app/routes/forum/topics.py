@@ -8,16 +8,18 @@ from typing import List
 from app.models import TopicModel, ErrorResponse, TopicCreateRequest, TopicUpdateRequest, ForumHideRequest
 from app.common.database.objects import DBForumTopic, DBUser, DBForumPost
 from app.common.database import forums, topics, posts
-from app.common.helpers import activity, permissions
+from app.common.helpers import activity
 from app.common.constants import UserActivity
 from app.security import require_login
-from app.utils import requires
+from app.utils import requires, has_permission, cached, purges, add_purge_tags, validated_response
 
 router = APIRouter(
     responses={404: {"description": "Forum/Topic not found", "model": ErrorResponse}}
 )
 
 @router.get("/{forum_id}/topics", response_model=List[TopicModel])
+@cached(30, 'forum:{forum_id}')
+@validated_response
 def get_forum_topics(
     request: Request,
     forum_id: int,
@@ -43,6 +45,7 @@ def get_forum_topics(
     ]
 
 @router.get("/{forum_id}/topics/{topic_id}", response_model=TopicModel)
+@cached(30, 'topic:{topic_id}')
 def get_topic(
     request: Request,
     forum_id: int,
@@ -60,6 +63,7 @@ def get_topic(
     return TopicModel.model_validate(topic, from_attributes=True)
 
 @router.post("/{forum_id}/topics", response_model=TopicModel, dependencies=[require_login])
+@purges('forum:{forum_id}')
 @requires("forum.topics.create")
 def create_topic(
     request: Request,
@@ -79,12 +83,12 @@ def create_topic(
     if len(data.content) > 2**14:
         raise HTTPException(400, "Post content is too long")
 
-    can_force_change_icon = permissions.has_permission(
+    can_force_change_icon = has_permission(
         "forum.moderation.topics.edit_icon",
-        request.user.id
+        request
     )
     can_change_icon = (
-        permissions.has_permission("forum.topics.edit_icon", request.user.id) and
+        has_permission("forum.topics.edit_icon", request) and
         forum.allow_icons
     )
 
@@ -94,9 +98,9 @@ def create_topic(
 
     # 'Options' refers to pinned/announcement status
     # which moderators and admins are allowed to set
-    can_set_options = permissions.has_permission(
+    can_set_options = has_permission(
         "forum.moderation.topics.set_options",
-        request.user.id
+        request
     )
     topic_attributes = {}
 
@@ -144,6 +148,7 @@ def create_topic(
     return TopicModel.model_validate(topic, from_attributes=True)
 
 @router.patch("/{forum_id}/topics/{topic_id}", response_model=TopicModel, dependencies=[require_login])
+@purges('forum:{forum_id}', 'topic:{topic_id}')
 @requires("forum.topics.edit")
 def update_topic(
     request: Request,
@@ -160,9 +165,9 @@ def update_topic(
     if topic.forum_id != forum_id:
         return RedirectResponse(f"/forum/{topic.forum_id}/topics/{topic.id}")
 
-    can_edit_others = permissions.has_permission(
+    can_edit_others = has_permission(
         "forum.moderation.topics.edit",
-        request.user.id
+        request
     )
 
     if topic.creator_id != request.user.id and not can_edit_others:
@@ -171,25 +176,25 @@ def update_topic(
     if topic.locked_at and not can_edit_others:
         raise HTTPException(403, "This topic is locked and cannot be edited")
 
-    can_lock_topic = permissions.has_permission(
+    can_lock_topic = has_permission(
         "forum.moderation.topics.lock",
-        request.user.id
+        request
     )
-    can_set_status = permissions.has_permission(
+    can_set_status = has_permission(
         "forum.moderation.topics.set_status",
-        request.user.id
+        request
     )
-    can_move_topic = permissions.has_permission(
+    can_move_topic = has_permission(
         "forum.moderation.topics.move",
-        request.user.id
+        request
     )
 
-    can_force_change_icon = permissions.has_permission(
+    can_force_change_icon = has_permission(
         "forum.moderation.topics.edit_icon",
-        request.user.id
+        request
     )
     can_change_icon = (
-        permissions.has_permission("forum.topics.edit_icon", request.user.id) and
+        has_permission("forum.topics.edit_icon", request) and
         topic.can_change_icon
     )
 
@@ -199,9 +204,9 @@ def update_topic(
 
     # 'Options' refers to pinned/announcement status
     # which moderators and admins are allowed to set
-    can_set_options = permissions.has_permission(
+    can_set_options = has_permission(
         "forum.moderation.topics.set_options",
-        request.user.id
+        request
     )
 
     updates = {}
@@ -241,6 +246,7 @@ def update_topic(
             {'forum_id': new_forum_id},
             session=request.state.db
         )
+        add_purge_tags(request, f'forum:{new_forum_id}')
 
     request.state.logger.info(
         f'{request.user.name} updated topic "{topic.title}" ({topic.id}).'
@@ -249,6 +255,7 @@ def update_topic(
     return TopicModel.model_validate(topic, from_attributes=True)
 
 @router.patch("/{forum_id}/topics/{topic_id}/hide", response_model=TopicModel, dependencies=[require_login])
+@purges('forum:{forum_id}', 'topic:{topic_id}')
 @requires("forum.moderation.topics.hide")
 def hide_topic(
     request: Request,
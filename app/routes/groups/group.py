@@ -1,6 +1,7 @@
 
 from app.models import UserModelCompact, GroupModel, ErrorResponse
 from app.common.database import groups
+from app.cache import reference
 
 from fastapi import HTTPException, APIRouter, Request
 from typing import List
@@ -10,10 +11,7 @@ responses = {404: {"description": "Group not found", "model": ErrorResponse}}
 
 @router.get("/", response_model=List[GroupModel])
 def get_groups(request: Request) -> List[GroupModel]:
-    return [
-        GroupModel.model_validate(group, from_attributes=True)
-        for group in groups.fetch_all(session=request.state.db)
-    ]
+    return reference.fetch('groups', request.state.db)
 
 @router.get("/{id}", response_model=GroupModel, responses=responses)
 def get_group(request: Request, id: int) -> GroupModel:
@@ -0,0 +1,19 @@
+
+from fastapi import HTTPException, APIRouter, Request
+from fastapi.responses import PlainTextResponse
+from app.common.helpers import ip
+
+import app.metrics
+
+router = APIRouter()
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def scrape_metrics(request: Request) -> PlainTextResponse:
+    """Request metrics of all workers, in the prometheus text format"""
+    if not ip.is_local_ip(ip.resolve_ip_address_fastapi(request)):
+        raise HTTPException(403, "Metrics are only available from local addresses")
+
+    return PlainTextResponse(
+        app.metrics.render(request.state.redis),
+        media_type="text/plain; version=0.0.4"
+    )
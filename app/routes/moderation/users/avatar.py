@@ -2,6 +2,7 @@
 from fastapi import HTTPException, APIRouter, Request
 from app.common.database import users
 from app.utils import requires
+from app import cache
 from datetime import datetime
 
 router = APIRouter()
@@ -27,4 +28,5 @@ def remove_user_avatar(
         },
         request.state.db
     )
+    cache.users.invalidate(user.id)
     return {}
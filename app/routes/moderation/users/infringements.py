@@ -1,9 +1,11 @@
 
 from app.common.helpers import infringements as infringements_helper
 from app.common.database import infringements, users
+from app.leaderboards import add_country_contribution, remove_country_contribution
 from app.models.moderation import *
 from app.session import events
-from app.utils import requires
+from app.utils import requires, purges
+from app import cache
 
 from fastapi import HTTPException, APIRouter, Request, Query
 from datetime import datetime, timedelta
@@ -20,6 +22,7 @@ def get_user_infringements(request: Request, user_id: int) -> List[InfringementM
     ]
 
 @router.post("/infringements", response_model=InfringementModel)
+@purges('rankings')
 @requires("users.moderation.infringements.create")
 def create_user_infringement(
     request: Request,
@@ -72,6 +75,7 @@ def update_user_infringement(
     )
 
 @router.delete("/infringements/{id}", response_model=InfringementModel)
+@purges('rankings')
 @requires("users.moderation.infringements.delete")
 def delete_user_infringement(
     request: Request,
@@ -98,6 +102,11 @@ def delete_user_infringement(
 
     # Call the appropriate handler for the action
     handlers[record.action]()
+    cache.users.invalidate(user.id)
+
+    if record.action == 0:
+        # Count the user towards their country again, if they were re-added to the leaderboards
+        add_country_contribution(user.id, user.country)
 
     # Delete the infringement record
     infringements.delete_by_id(
@@ -121,6 +130,9 @@ def handle_restrict(
     if user.restricted:
         raise HTTPException(400, "User is already restricted")
 
+    # Take the user out of the country rankings, while they are still on the leaderboards
+    remove_country_contribution(user.id, user.country)
+
     record = infringements_helper.restrict_user(
         user,
         data.description,
@@ -134,6 +146,8 @@ def handle_restrict(
     if not record:
         raise HTTPException(500, "Failed to create infringement record")
 
+    cache.users.invalidate(user.id)
+
     events.submit(
         "logout",
         user.id
@@ -165,6 +179,8 @@ def handle_silence(
     if not record:
         raise HTTPException(500, "Failed to create infringement record")
 
+    cache.users.invalidate(user.id)
+
     # Update user on bancho
     events.submit(
         "update_user_silence",
@@ -3,6 +3,7 @@ from fastapi import HTTPException, APIRouter, Request
 from app.models import NameHistoryModel, NameHistoryUpdateRequest, NameChangeRequest
 from app.common.database import names, users
 from app.utils import requires
+from app import cache
 from typing import List
 
 router = APIRouter()
@@ -36,6 +37,8 @@ def change_user_name(
     if not success:
         raise HTTPException(500, "Failed to update user name")
 
+    cache.users.invalidate(user.id)
+
     return NameHistoryModel.model_validate(
         entry,
         from_attributes=True
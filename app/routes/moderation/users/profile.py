@@ -3,7 +3,9 @@ from fastapi import HTTPException, APIRouter, Request
 from app.models import UserMetadataModel, UserMetadataUpdateRequest
 from app.common.database import logins, users
 from app.common.cache import leaderboards
-from app.utils import requires
+from app.leaderboards import add_country_contribution, remove_country_contribution
+from app.utils import requires, purges
+from app import cache
 from typing import List
 
 router = APIRouter()
@@ -23,6 +25,7 @@ def get_user_profile(
     )
 
 @router.patch("/profile", response_model=UserMetadataModel)
+@purges('rankings')
 @requires("users.moderation.profile.update")
 def update_user_profile(
     request: Request,
@@ -33,6 +36,9 @@ def update_user_profile(
         raise HTTPException(404, "User not found")
 
     if update.country.lower() != user.country.lower():
+        # Move the user's stats over to the new country rankings
+        remove_country_contribution(user.id, user.country)
+
         # Remove from old country leaderboard
         leaderboards.remove_country(user.id, user.country)
 
@@ -40,6 +46,8 @@ def update_user_profile(
             # Re-add to leaderboard with new country
             leaderboards.update(stats, update.country)
 
+        add_country_contribution(user.id, update.country)
+
     success = users.update(
         user.id,
         {
@@ -64,6 +72,8 @@ def update_user_profile(
     if not success:
         raise HTTPException(500, "Failed to update user profile")
 
+    cache.users.invalidate(user.id)
+
     # Refresh user object
     request.state.db.refresh(user)
 
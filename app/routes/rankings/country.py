@@ -1,6 +1,8 @@
 
 from app.common.constants import COUNTRIES
 from app.common.cache import leaderboards
+from app.leaderboards import fetch_country_rankings
+from app.utils import validated_response
 from app.models import (
     CountryEntryModel,
     CountryStatsModel,
@@ -13,6 +15,7 @@ from typing import List
 router = APIRouter()
 
 @router.get("/country/{mode}", response_model=List[CountryEntryModel])
+@validated_response
 def get_country_rankings(request: Request, mode: ModeAlias) -> List[CountryEntryModel]:
     return [
         CountryEntryModel(
@@ -21,9 +24,17 @@ def get_country_rankings(request: Request, mode: ModeAlias) -> List[CountryEntry
             country_name=resolve_country_name(country['name']),
             stats=resolve_country_stats(country)
         )
-        for index, country in enumerate(leaderboards.top_countries(mode.integer))
+        for index, country in enumerate(resolve_countries(mode.integer))
     ]
 
+def resolve_countries(mode: int) -> List[dict]:
+    # Fall back to aggregating the leaderboards, until the
+    # background job has built the initial aggregates
+    return (
+        fetch_country_rankings(mode) or
+        leaderboards.top_countries(mode)
+    )
+
 def resolve_country_stats(country: dict) -> CountryStatsModel:
     return CountryStatsModel(
         average_performance=country['average_pp'],
@@ -1,20 +1,23 @@
 
 from app.models import RankingEntryModelWithoutStats, UserModelWithStats
-from app.common.database.repositories import users
-from app.common.database.objects import DBUser
 from app.common.cache import leaderboards
+from app.utils import validated_response
+from app.responses import ORJSONResponse
+from app.cache import rankings, cards
 
-from fastapi import Request, APIRouter, Query
-from typing import List
+from fastapi import Request, Response, APIRouter, Query
+from typing import List, Tuple
+from sqlalchemy.orm import Session
 
 router = APIRouter()
 
 @router.get("/kudosu", response_model=List[RankingEntryModelWithoutStats])
+@validated_response
 def get_kudosu_rankings(
     request: Request,
     offset: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=50)
-) -> List[RankingEntryModelWithoutStats]:
+) -> Response:
     top_players = leaderboards.top_players(
         None,
         offset,
@@ -22,11 +25,26 @@ def get_kudosu_rankings(
         'kudosu'
     )
 
-    # Fetch user info from database
-    user_objects = users.fetch_many(
+    body = rankings.resolve(
+        rankings.board_name('kudosu'),
+        offset, limit, top_players,
+        lambda fresh: ORJSONResponse(resolve_entries(request.state.db, top_players, offset, fresh)).body
+    )
+
+    return Response(body, media_type='application/json')
+
+def resolve_entries(
+    session: Session,
+    top_players: List[Tuple[int, float]],
+    offset: int,
+    fresh: bool = False
+) -> List[RankingEntryModelWithoutStats]:
+    # Fetch user cards from the cache, falling back to the database
+    user_objects = cards.fetch_many(
         (user_id for user_id, score in top_players),
-        DBUser.stats,
-        session=request.state.db
+        session,
+        stats=True,
+        fresh=fresh
     )
     users_by_id = {
         user.id: user
@@ -1,7 +1,8 @@
 
-from app.common.database.objects import DBUser
-from app.common.database import users, stats
 from app.common.cache import leaderboards
+from app.responses import ORJSONResponse
+from app.leaderboards import fetch_ranks, fetch_around
+from app.cache import rankings, cards
 from app import utils
 from app.models import (
     UserModelWithStats,
@@ -11,15 +12,16 @@ from app.models import (
     ModeAlias
 )
 
-from fastapi import Request, APIRouter, Query
+from fastapi import HTTPException, Request, Response, APIRouter, Query
+from typing import List, Tuple
 from sqlalchemy.orm import Session
-from typing import List
-
-import app.session
 
 router = APIRouter()
 
 @router.get("/{order}/{mode}", response_model=List[RankingEntryModel])
+@utils.cached(rankings.RESPONSE_TTL, 'rankings')
+@utils.coalesced
+@utils.validated_response
 def get_rankings(
     request: Request,
     order: OrderType,
@@ -27,22 +29,91 @@ def get_rankings(
     offset: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=50),
     country: str | None = Query(None)
-) -> List[RankingEntryModel]:
+) -> Response:
+    # Leaderboard & card lookups use the sync redis client,
+    # so this runs in the threadpool instead of the event loop
+    return resolve_rankings(
+        request.state.db,
+        order, mode, offset, limit, country
+    )
+
+def resolve_rankings(
+    session: Session,
+    order: OrderType,
+    mode: ModeAlias,
+    offset: int,
+    limit: int,
+    country: str | None
+) -> Response:
+    country = (
+        country.lower()
+        if country is not None else None
+    )
+
     top_players = leaderboards.top_players(
         mode.integer,
         offset, limit,
         order.value,
-        country=(
-            country.lower()
-            if country is not None else None
+        country=country
+    )
+
+    body = rankings.resolve(
+        rankings.board_name(order.value, mode.integer, country),
+        offset, limit, top_players,
+        lambda fresh: ORJSONResponse(resolve_entries(session, top_players, mode, offset, fresh)).body
+    )
+
+    return Response(body, media_type='application/json')
+
+@router.get("/{order}/{mode}/around/{user_id}", response_model=List[RankingEntryModel])
+@utils.cached(30, 'rankings')
+@utils.coalesced
+@utils.validated_response
+async def get_rankings_around(
+    request: Request,
+    order: OrderType,
+    mode: ModeAlias,
+    user_id: int,
+    radius: int = Query(5, ge=1, le=25),
+    country: str | None = Query(None)
+) -> List[RankingEntryModel]:
+    # Resolve the rank & the surrounding players in a single call
+    window = await fetch_around(
+        user_id,
+        order.value,
+        mode.integer,
+        radius,
+        country=country,
+        redis=request.state.redis_async
+    )
+
+    if window is None:
+        raise HTTPException(
+            status_code=404,
+            detail="The requested user is not ranked"
         )
+
+    # Card & rank lookups use the sync redis client, so the
+    # entries are built in the threadpool, off the event loop
+    offset, players = window
+    return await utils.run_async(
+        resolve_entries,
+        request.state.db, players, mode, offset
     )
 
-    # Fetch user info from database
-    user_objects = users.fetch_many(
+def resolve_entries(
+    session: Session,
+    top_players: List[Tuple[int, float]],
+    mode: ModeAlias,
+    offset: int,
+    fresh: bool = False
+) -> List[RankingEntryModel]:
+    # Fetch user cards from the cache, falling back to the database
+    user_objects = cards.fetch_many(
         (user_id for user_id, score in top_players),
-        DBUser.stats,
-        session=request.state.db
+        session,
+        stats=True,
+        fresh=fresh
     )
     users_by_id = {
         user.id: user
@@ -70,39 +141,15 @@ def get_rankings(
         for index, (user_id, score) in enumerate(top_players)
     ]
 
-def resolve_stats_models(users: List[DBUser], mode: int) -> dict[int, RankingStatsModel]:
+def resolve_stats_models(users: List[cards.UserCard], mode: int) -> dict[int, RankingStatsModel]:
     if not users:
         return {}
 
-    rank_keys = (
-        ('global_rank', lambda user: f'bancho:performance:{mode}'),
-        ('country_rank', lambda user: f'bancho:performance:{mode}:{user.country.lower()}'),
-        ('score_rank', lambda user: f'bancho:rscore:{mode}'),
-        ('score_rank_country', lambda user: f'bancho:rscore:{mode}:{user.country.lower()}'),
-        ('total_score_rank', lambda user: f'bancho:tscore:{mode}'),
-        ('total_score_rank_country', lambda user: f'bancho:tscore:{mode}:{user.country.lower()}'),
-        ('ppv1_rank', lambda user: f'bancho:ppv1:{mode}'),
-        ('ppv1_rank_country', lambda user: f'bancho:ppv1:{mode}:{user.country.lower()}')
+    # Resolve all eight ranks of every user in a single script call
+    rank_values = fetch_ranks(
+        ((user.id, user.country) for user in users),
+        mode
     )
-    requests = []
-
-    with app.session.redis.pipeline() as pipe:
-        for user in users:
-            for field, key_factory in rank_keys:
-                pipe.zrevrank(key_factory(user), user.id)
-                requests.append((user.id, field))
-
-        results = pipe.execute()
-
-    rank_values = {
-        user.id: {}
-        for user in users
-    }
-
-    for (user_id, field), rank in zip(requests, results):
-        rank_values[user_id][field] = (
-            rank + 1 if rank is not None else 0
-        )
 
     return {
         user_id: RankingStatsModel(**values)
@@ -4,18 +4,18 @@ from typing import List
 
 from app.models import ModdedReleaseModel, ModdedReleaseUploadRequest, ModdedReleaseUpdatePath, ModdedReleaseEntryModel
 from app.common.database import releases
-from app.utils import requires
+from app.cache import reference
+from app.utils import requires, conditional
 
 router = APIRouter()
 
 @router.get("/modded", response_model=List[ModdedReleaseModel])
+@conditional
 def get_modded_releases(request: Request) -> List[ModdedReleaseModel]:
-    return [
-        ModdedReleaseModel.model_validate(client, from_attributes=True)
-        for client in releases.fetch_modded_all(request.state.db)
-    ]
+    return reference.fetch('modded_releases', request.state.db)
 
 @router.get("/modded/{identifier}", response_model=ModdedReleaseModel)
+@conditional
 def get_modded_release(
     request: Request,
     identifier: str
@@ -34,6 +34,7 @@ def get_modded_release(
     )
 
 @router.get("/modded/{identifier}/entries", response_model=List[ModdedReleaseEntryModel])
+@conditional
 def get_modded_release_entries(
     request: Request,
     identifier: str,
@@ -129,6 +130,7 @@ def delete_modded_release(
     return {}
 
 @router.get("/modded/{identifier}/entries/{id}", response_model=ModdedReleaseEntryModel)
+@conditional
 def get_modded_release_entry(
     request: Request,
     identifier: str,
@@ -197,6 +199,7 @@ def update_modded_release_entry(
     )
 
 @router.get("/modded/{identifier}/update", response_model=ModdedReleaseUpdatePath)
+@conditional
 def get_modded_release_update_path(
     request: Request,
     identifier: str,
@@ -6,7 +6,7 @@ from typing import List
 from app.models import OsuReleaseUploadRequest, OsuChangelogModel, OsuReleaseModel
 from app.common.database import releases, changelog
 from app.common.constants.regexes import OSU_VERSION
-from app.utils import requires
+from app.utils import requires, conditional
 
 router = APIRouter()
 
@@ -15,6 +15,7 @@ client_cutoff = datetime(2015, 12, 30)
 min_date = datetime(2007, 1, 1)
 
 @router.get("/official", response_model=List[OsuReleaseModel])
+@conditional
 def get_official_releases(
     request: Request,
     stream: str | None = Query(None),
@@ -83,6 +84,7 @@ def create_official_release(
     )
 
 @router.get("/official/lookup/{criteria}", response_model=List[OsuReleaseModel])
+@conditional
 def lookup_official_releases(request: Request, criteria: str) -> List[OsuReleaseModel]:
     match = OSU_VERSION.match(criteria)
 
@@ -115,6 +117,7 @@ def lookup_official_releases(request: Request, criteria: str) -> List[OsuRelease
     ]
 
 @router.get("/official/changelog", response_model=List[OsuChangelogModel])
+@conditional
 def get_osu_changelog(
     request: Request,
     start: datetime = Query(client_cutoff, ge=min_date),
@@ -141,6 +144,7 @@ def get_osu_changelog(
     ]
 
 @router.get("/official/{release_id}", response_model=OsuReleaseModel)
+@conditional
 def get_official_release(
     request: Request,
     release_id: int
@@ -3,13 +3,12 @@ from fastapi import APIRouter, Request
 from typing import List
 
 from app.models import TitanicReleaseModel
-from app.common.database import releases
+from app.cache import reference
+from app.utils import conditional
 
 router = APIRouter()
 
 @router.get("/", response_model=List[TitanicReleaseModel])
+@conditional
 def get_titanic_releases(request: Request) -> List[TitanicReleaseModel]:
-    return [
-        TitanicReleaseModel.model_validate(client, from_attributes=True)
-        for client in releases.fetch_all(request.state.db)
-    ]
+    return reference.fetch('releases', request.state.db)
@@ -1,20 +1,20 @@
 
 from app.common.database.objects import DBBeatmap, DBBeatmapset
 from app.common.database import beatmaps, beatmapsets
-from app.common.helpers import permissions
+from fastapi import HTTPException, Request
+from app.utils import has_permission
 from sqlalchemy.orm import Session
-from fastapi import HTTPException
 
-def validate_beatmap_for_upload(beatmap_id: int, user_id: int, db: Session) -> DBBeatmap:
+def validate_beatmap_for_upload(beatmap_id: int, request: Request, db: Session) -> DBBeatmap:
     if not (beatmap := beatmaps.fetch_by_id(beatmap_id, db)):
         raise HTTPException(
             status_code=404,
             detail="The requested beatmap could not be found"
         )
 
-    can_force_replace = permissions.has_permission(
+    can_force_replace = has_permission(
         'beatmaps.moderation.resources',
-        user_id
+        request
     )
 
     if beatmap.status > 0 and not can_force_replace:
@@ -28,7 +28,7 @@ def validate_beatmap_for_upload(beatmap_id: int, user_id: int, db: Session) -> D
 def validate_beatmapset_for_upload(
     set_id: int,
     db: Session,
-    user_id: int | None = None,
+    request: Request | None = None,
     require_unranked: bool = False,
 ) -> DBBeatmapset:
     if not (beatmapset := beatmapsets.fetch_one(set_id, db)):
@@ -41,8 +41,8 @@ def validate_beatmapset_for_upload(
         return beatmapset
 
     can_force_replace = (
-        user_id is not None and
-        permissions.has_permission('beatmaps.moderation.resources', user_id)
+        request is not None and
+        has_permission('beatmaps.moderation.resources', request)
     )
 
     if beatmapset.status > 0 and not can_force_replace:
@@ -5,7 +5,7 @@ from .helpers import validate_beatmapset_for_upload
 
 from app.common.storage.base import BaseStorage
 from app.security import require_login
-from app.utils import resize_image
+from app.utils import resize_image, run_blocking
 from app.utils import requires
 from datetime import timedelta
 from io import BytesIO
@@ -67,7 +67,7 @@ def get_small_background(storage: BaseStorage, filename: str) -> bytes | None:
     if not (large := storage.get_background(filename)):
         return None
 
-    resized = resize_image(large, 80, 60).getvalue()
+    resized = run_blocking(resize_image, large, 80, 60).getvalue()
     storage.save_to_cache(
         name=f'mt:{filename}',
         content=resized,
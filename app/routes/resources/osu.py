@@ -8,7 +8,7 @@ from hashlib import md5
 
 from app.common.database.repositories import beatmaps
 from app.security import require_login
-from app.utils import requires
+from app.utils import requires, purges
 
 router = APIRouter()
 
@@ -30,13 +30,14 @@ def get_internal_beatmap(request: Request, filename: str):
     )
 
 @router.put("/osu/{beatmap_id}", dependencies=[require_login])
+@purges('beatmap:{beatmap_id}')
 @requires("beatmaps.resources.osu.upload")
 def upload_internal_beatmap(
     request: Request,
     beatmap_id: int,
     osu: UploadFile = File(...)
 ) -> Response:
-    beatmap = validate_beatmap_for_upload(beatmap_id, request.user.id, request.state.db)
+    beatmap = validate_beatmap_for_upload(beatmap_id, request, request.state.db)
     beatmap_data = osu.file.read()
 
     request.state.storage.upload_beatmap_file(
@@ -55,7 +55,7 @@ def upload_internal_osz(
     beatmapset = validate_beatmapset_for_upload(
         set_id,
         request.state.db,
-        user_id=request.user.id,
+        request=request,
         require_unranked=True,
     )
 
@@ -6,6 +6,7 @@ from app.common.database.repositories import groups, users, names
 from app.common.config import config_instance as config
 from app.models.kofi import KofiWebhookData
 from app.common import webhooks, officer
+from app import cache
 
 router = APIRouter()
 donator_group_id = 6
@@ -64,4 +65,5 @@ def assign_donator_group(data: KofiWebhookData, request: Request) -> bool:
         user.id, donator_group_id,
         session=request.state.db
     )
+    cache.users.invalidate(user.id)
     return True
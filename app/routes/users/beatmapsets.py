@@ -7,7 +7,7 @@ from typing import List
 from app.models import BeatmapsetModel, ErrorResponse, BeatmapsetDescriptionUpdate
 from app.common.database import users, beatmapsets, beatmaps, topics, posts, nominations
 from app.common.constants import BeatmapStatus, UserActivity
-from app.utils import requires, primary_beatmapset_mode
+from app.utils import requires, purges, primary_beatmapset_mode
 from app.common.helpers import activity
 
 router = APIRouter()
@@ -83,6 +83,7 @@ def get_user_beatmapset(request: Request, user_id: int, beatmapset_id: int) -> B
     return BeatmapsetModel.model_validate(beatmapset, from_attributes=True)
 
 @router.post("/{user_id}/beatmapsets/{beatmapset_id}/revive", response_model=BeatmapsetModel, responses=action_responses)
+@purges('beatmapset:{beatmapset_id}', 'user:{user_id}')
 @requires("beatmaps.revive")
 def revive_beatmapset(
     request: Request,
@@ -168,6 +169,7 @@ def revive_beatmapset(
     return BeatmapsetModel.model_validate(beatmapset, from_attributes=True)
 
 @router.patch("/{user_id}/beatmapsets/{beatmapset_id}/description", response_model=BeatmapsetModel, responses=action_responses)
+@purges('beatmapset:{beatmapset_id}', 'user:{user_id}')
 @requires("beatmaps.update_description")
 def update_beatmapset_description(
     request: Request,
@@ -238,6 +240,7 @@ def update_beatmapset_description(
     return BeatmapsetModel.model_validate(beatmapset, from_attributes=True)
 
 @router.delete("/{user_id}/beatmapsets/{beatmapset_id}", response_model=BeatmapsetModel, responses=action_responses)
+@purges('beatmapset:{beatmapset_id}', 'user:{user_id}')
 @requires("beatmaps.delete")
 def delete_beatmapset(
     request: Request,
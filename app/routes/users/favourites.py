@@ -5,6 +5,7 @@ from app.common.config import config_instance as config
 from app.common.constants import UserActivity
 from app.common.helpers import activity
 from app.utils import requires
+from app.cache import cards
 
 from fastapi import HTTPException, APIRouter, Request, Body
 from typing import List
@@ -18,7 +19,7 @@ router = APIRouter(
 
 @router.get("/{user_id}/favourites", response_model=List[FavouriteModel])
 def get_favourites(request: Request, user_id: int) -> List[FavouriteModel]:
-    if not (user := users.fetch_by_id(user_id, session=request.state.db)):
+    if not (user := cards.fetch_one(user_id, request.state.db)):
         raise HTTPException(
             status_code=404,
             detail="The requested user could not be found"
@@ -35,9 +36,12 @@ def get_favourites(request: Request, user_id: int) -> List[FavouriteModel]:
         request.state.db
     )
 
+    # Every favourite shares the same user, so it's only validated once
+    user_model = UserModelCompact.model_validate(user, from_attributes=True)
+
     return [
         FavouriteModel(
-            user=UserModelCompact.model_validate(user, from_attributes=True),
+            user=user_model,
             beatmapset=BeatmapsetModel.model_validate(favourite.beatmapset, from_attributes=True),
             created_at=favourite.created_at
         )
@@ -46,7 +50,7 @@ def get_favourites(request: Request, user_id: int) -> List[FavouriteModel]:
 
 @router.get("/{user_id}/favourites/{set_id}", response_model=FavouriteModel)
 def get_favourite(request: Request, user_id: int, set_id: int) -> FavouriteModel:
-    if not (user := users.fetch_by_id(user_id, session=request.state.db)):
+    if not (user := cards.fetch_one(user_id, request.state.db)):
         raise HTTPException(
             status_code=404,
             detail="The requested user could not be found"
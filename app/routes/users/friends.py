@@ -2,6 +2,7 @@
 from fastapi import HTTPException, Request, APIRouter
 from app.common.database import users, relationships
 from app.models import UserModelCompact
+from app.cache import cards
 from typing import List
 
 router = APIRouter()
@@ -20,8 +21,13 @@ def get_friends(request: Request, user_id: int) -> List[UserModelCompact]:
             detail='The requested user could not be found'
         )
 
-    return [
-        UserModelCompact.model_validate(friend.target, from_attributes=True)
+    friend_ids = [
+        friend.target_id
         for friend in relationships.fetch_many_by_id(user.id, request.state.db)
         if friend.status == 0
     ]
+
+    return [
+        UserModelCompact.model_validate(card, from_attributes=True)
+        for card in cards.fetch_many(friend_ids, request.state.db)
+    ]
@@ -4,6 +4,7 @@ from app.models import ErrorResponse, PlaystyleRequestModel, PlaystyleResponseMo
 from app.common.database.repositories import users
 from app.common.constants import Playstyle
 from app.utils import requires
+from app import cache
 
 router = APIRouter(
     responses={403: {"model": ErrorResponse, "description": "Unauthorized action"}}
@@ -53,6 +54,7 @@ def add_playstyle(
         {'playstyle': new_playstyle.value},
         request.state.db
     )
+    cache.users.invalidate(user.id)
 
     return PlaystyleResponseModel(playstyle=new_playstyle.value)
 
@@ -84,5 +86,6 @@ def remove_playstyle(
         {'playstyle': new_playstyle.value},
         request.state.db
     )
+    cache.users.invalidate(user.id)
 
     return PlaystyleResponseModel(playstyle=new_playstyle.value)
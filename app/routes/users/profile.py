@@ -1,13 +1,22 @@
 
 from fastapi import HTTPException, APIRouter, Request
 from app.models import UserModel, StatsModel, ModeAlias
+from sqlalchemy.orm import Session
 from app.common.database import users, stats
+from app.utils import cached, coalesced, conditional, validated_response
 
 router = APIRouter()
 
 @router.get("/{user_id}", response_model=UserModel)
+@cached(60, 'user:{user_id}')
+@coalesced
+@conditional
+@validated_response
 def get_user_profile(request: Request, user_id: int) -> UserModel:
-    if not (user := users.fetch_by_id(user_id, session=request.state.db)):
+    return resolve_user_profile(request.state.db, user_id)
+
+def resolve_user_profile(session: Session, user_id: int) -> UserModel:
+    if not (user := users.fetch_by_id(user_id, session=session)):
         raise HTTPException(
             status_code=404,
             detail="The requested user could not be found"
@@ -2,6 +2,8 @@
 from app.common.config import config_instance as config
 from app.common.database.objects import DBUser
 from app.common.constants import TokenSource
+from app.cache.local import LocalCache
+from app.metrics import collector
 from app import utils
 
 from redis.asyncio import Redis as RedisAsync
@@ -10,6 +12,7 @@ from fastapi import Header, Depends
 from hashlib import md5
 
 import asyncio
+import hashlib
 import secrets
 import bcrypt
 import json
@@ -20,6 +23,10 @@ WEBSITE_SESSION_COOKIE_NAME = "titanic_session"
 TOKEN_TYPE_REFRESH = "refresh"
 TOKEN_TYPE_ACCESS = "access"
 
+# Decoded claims of recently validated tokens, keyed by the token digest
+CLAIMS_CACHE_TTL = 300
+claims_cache = LocalCache(maxsize=10000, ttl=CLAIMS_CACHE_TTL)
+
 def session_key(token_id: str) -> str:
     return f"authentication:session:{token_id}"
 
@@ -49,13 +56,9 @@ def generate_token(
     )
 
 def validate_token(token: str, token_type: str | None = None) -> dict | None:
-    try:
-        data = jwt.decode(
-            token,
-            config.FRONTEND_SECRET_KEY,
-            algorithms=['HS256']
-        )
-    except jwt.PyJWTError:
+    data = decode_token(token)
+
+    if not data:
         return
 
     # Check if the token is expired
@@ -70,12 +73,43 @@ def validate_token(token: str, token_type: str | None = None) -> dict | None:
 
     return data
 
+def decode_token(token: str) -> dict | None:
+    digest = hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+    if (data := claims_cache.get(digest)) is not None:
+        collector.increment('jwt_claims_cache_hits')
+        return data
+
+    collector.increment('jwt_claims_cache_misses')
+
+    try:
+        data = jwt.decode(
+            token,
+            config.FRONTEND_SECRET_KEY,
+            algorithms=['HS256']
+        )
+    except jwt.PyJWTError:
+        return
+
+    # Keep the claims until the token expires at the latest
+    ttl = min(data['exp'] - time.time(), CLAIMS_CACHE_TTL)
+
+    if ttl > 0:
+        claims_cache.set(digest, data, ttl=ttl)
+
+    return data
+
+def website_session_key(session_id: str) -> str:
+    return f"authentication:website:{session_id}"
+
 async def validate_website_session(session_id: str, redis: RedisAsync) -> dict | None:
     if not session_id or redis is None:
         return None
 
-    payload = await redis.get(f"authentication:website:{session_id}")
+    payload = await redis.get(website_session_key(session_id))
+    return parse_website_session(payload)
 
+def parse_website_session(payload: str | None) -> dict | None:
     if not payload:
         return None
 
@@ -241,9 +275,11 @@ async def validate_api_token(token: str, redis: RedisAsync, now: int | None = No
     return None
 
 def password_authentication(password: str, bcrypt_hash: str) -> bool:
-    return md5_authentication(
+    return utils.run_blocking(
+        md5_authentication,
         md5(password.encode()).hexdigest(),
-        bcrypt_hash
+        bcrypt_hash,
+        executor='bcrypt'
     )
 
 def md5_authentication(md5: str, bcrypt_hash: str) -> bool:
@@ -255,7 +291,8 @@ def md5_authentication(md5: str, bcrypt_hash: str) -> bool:
 async def md5_authentication_async(md5: str, bcrypt: str) -> bool:
     return await utils.run_async(
         md5_authentication,
-        md5, bcrypt
+        md5, bcrypt,
+        executor='bcrypt'
     )
 
 async def password_authentication_async(password: str, bcrypt: str) -> bool:
@@ -1,10 +1,12 @@
 
 from app.routes import router as BaseRouter
+from app.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app import session
+from app import session, executors, leaderboards, warmup
 
 import warnings
+import asyncio
 import logging
 
 logging.basicConfig(
@@ -25,10 +27,20 @@ async def lifespan(app: FastAPI):
     session.database.wait_for_connection()
     session.redis.ping()
     session.filters.populate()
+
+    if session.config.API_WARMUP:
+        await warmup.warmup(app)
+
+    aggregates_task = asyncio.create_task(leaderboards.maintain_country_aggregates())
+    countries_task = asyncio.create_task(leaderboards.watch_country_leaderboards())
+
     yield
+    aggregates_task.cancel()
+    countries_task.cancel()
     session.database.engine.dispose()
     session.redis.close()
     await session.redis_async.close()
+    executors.shutdown()
 
 api = FastAPI(
     title='Titanic! API',
@@ -38,6 +50,7 @@ api = FastAPI(
     redoc_url="/docs",
     docs_url=None,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     contact={
         "name": "Titanic",
         "url": "https://osu.titanic.sh",
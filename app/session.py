@@ -4,7 +4,7 @@ from .common.helpers.filter import ChatFilter
 from .common.cache.events import EventQueue
 from .common.database import Postgres
 from .common.storage import Storage
-from .common.config import Config
+from .config import KeelConfig
 
 from redis.asyncio import Redis as RedisAsync
 from requests import Session
@@ -13,7 +13,7 @@ from redis import Redis
 import logging
 import time
 
-config = Config() # type: ignore
+config = KeelConfig() # type: ignore
 database = Postgres(config)
 storage = Storage(config)
 
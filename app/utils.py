@@ -5,16 +5,22 @@ from app.common.database.repositories import wrapper
 from app.common.database import stats, histories
 from app.common.helpers import permissions
 from app.common.cache import leaderboards
+from app.responses import ORJSONResponse
+from app.executors import executors
 
-from typing import Callable, Generator, Tuple, List
-from fastapi import HTTPException, Request
+from typing import Any, Callable, Generator, Tuple, List
+from fastapi import HTTPException, Request, Response
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
 from sqlalchemy.orm import Session
+from pydantic import TypeAdapter
 from collections import Counter
 from itertools import tee
-from PIL import Image
 
 import app.session
+import app.cache
 import functools
+import hashlib
 import inspect
 import asyncio
 import typing
@@ -22,8 +28,11 @@ import string
 import random
 import io
 
-async def run_async(func: Callable, *args):
-    return await asyncio.get_event_loop().run_in_executor(None, func, *args)
+async def run_async(func: Callable, *args, executor: str = 'io'):
+    return await executors[executor].run(func, *args)
+
+def run_blocking(func: Callable, *args, executor: str = 'cpu'):
+    return executors[executor].call(func, *args)
 
 def random_string(length: int, pool: str = string.ascii_letters + string.digits) -> str:
     return ''.join(random.choices(pool, k=length))
@@ -57,6 +66,9 @@ def resize_image(
     target_width: int | None = None,
     target_height: int | None = None
 ) -> io.BytesIO:
+    # Pillow is only needed by a few upload routes, so it's imported on first use
+    from PIL import Image
+
     image_buffer = io.BytesIO()
     img = Image.open(io.BytesIO(image))
     img = img.resize((target_width, target_height))
@@ -92,6 +104,7 @@ def sync_ranks(user: DBUser, session: Session) -> None:
             session=session
         )
         user_stats.rank = global_rank
+        app.cache.cards.invalidate_stats(user.id)
 
         if not config.FROZEN_RANK_UPDATES:
             # Update rank history
@@ -101,6 +114,263 @@ def sync_ranks(user: DBUser, session: Session) -> None:
                 session=session
             )
 
+def to_response(content: Any) -> Response:
+    if isinstance(content, Response):
+        return content
+
+    return ORJSONResponse(content)
+
+def validated_response(func: typing.Callable) -> typing.Callable:
+    """This function marks the return value of a route as already validated, so that it skips the `response_model` validation"""
+    @functools.wraps(func)
+    async def async_wrapper(*args, **kwargs):
+        return to_response(await func(*args, **kwargs))
+
+    @functools.wraps(func)
+    def sync_wrapper(*args, **kwargs):
+        return to_response(func(*args, **kwargs))
+
+    if asyncio.iscoroutinefunction(func):
+        return async_wrapper
+    else:
+        return sync_wrapper
+
+def ratelimit_cost(cost: int) -> typing.Callable[[typing.Callable], typing.Callable]:
+    """This function sets the amount of units a route takes from the ratelimit budget"""
+    def decorator(func: typing.Callable) -> typing.Callable:
+        func.ratelimit_cost = cost
+        return func
+
+    return decorator
+
+def coalesced(func: typing.Callable) -> typing.Callable:
+    """This function allows identical concurrent anonymous requests to a route to share one response"""
+    func.coalesced = True
+    return func
+
+def cached(ttl: int, *tags: str) -> typing.Callable[[typing.Callable], typing.Callable]:
+    """This function lets anonymous responses of a route be cached, until the ttl expires or one of the tags gets purged"""
+    def decorator(func: typing.Callable) -> typing.Callable:
+        func.cache_ttl = ttl
+        func.cache_tags = tags
+        return func
+
+    return decorator
+
+def add_cache_tags(request: Request, *tags: str) -> None:
+    """This function tags the cached response of the current request, e.g. with the parent entity"""
+    request.state.cache_tags = [*getattr(request.state, 'cache_tags', []), *tags]
+
+def add_purge_tags(request: Request, *tags: str) -> None:
+    """This function purges additional tags with the ones of `purges`, e.g. the new parent of a moved entity"""
+    request.state.purge_tags = [*getattr(request.state, 'purge_tags', []), *tags]
+
+def purge_committed(request: Request, tags: List[str]) -> None:
+    # Commit before purging, so that a concurrent request can't cache the
+    # old data again, and purge before the response gets sent, so that the
+    # client's next request doesn't get served the old data either
+    if request.state.db.is_open:
+        request.state.db.commit()
+
+    app.cache.responses.purge(*tags)
+
+def purges(*tags: str) -> typing.Callable[[typing.Callable], typing.Callable]:
+    """This function purges the cached responses of the given tags, once the route has succeeded & its changes are committed"""
+    def decorator(func: typing.Callable) -> typing.Callable:
+        signature = inspect.signature(func)
+
+        def resolve_tags(*args, **kwargs) -> Tuple[Request, List[str]]:
+            arguments = signature.bind_partial(*args, **kwargs).arguments
+            request = arguments['request']
+            return request, [
+                *(tag.format(**arguments) for tag in tags),
+                *getattr(request.state, 'purge_tags', [])
+            ]
+
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            result = await func(*args, **kwargs)
+            await run_async(purge_committed, *resolve_tags(*args, **kwargs))
+            return result
+
+        @functools.wraps(func)
+        def sync_wrapper(*args, **kwargs):
+            result = func(*args, **kwargs)
+            purge_committed(*resolve_tags(*args, **kwargs))
+            return result
+
+        if asyncio.iscoroutinefunction(func):
+            return async_wrapper
+        else:
+            return sync_wrapper
+
+    return decorator
+
+class NotModified(Exception):
+    """Raised by `check_preconditions`, when the client's copy of a response is still up-to-date"""
+
+def http_date(value: datetime) -> str:
+    return value.strftime('%a, %d %b %Y %H:%M:%S GMT')
+
+def entity_tag(*versions: Any) -> str:
+    """This function creates a strong ETag from the version columns of an entity"""
+    digest = hashlib.blake2b(repr(versions).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+def to_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        # Database timestamps are stored in utc
+        return value
+
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+def is_not_modified(request: Request, etag: str | None, last_modified: datetime | None) -> bool:
+    if request.method not in ('GET', 'HEAD'):
+        return False
+
+    if (if_none_match := request.headers.get('If-None-Match')) is not None:
+        # If-None-Match takes precedence over If-Modified-Since
+        tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+        return etag is not None and ('*' in tags or etag in tags)
+
+    if last_modified is None:
+        return False
+
+    if not (if_modified_since := request.headers.get('If-Modified-Since')):
+        return False
+
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+    return to_utc(last_modified).replace(microsecond=0) <= to_utc(since)
+
+def validator_headers(etag: str | None, last_modified: datetime | None) -> dict:
+    headers = {}
+
+    if etag is not None:
+        headers['ETag'] = etag
+
+    if last_modified is not None:
+        headers['Last-Modified'] = http_date(to_utc(last_modified))
+
+    return headers
+
+def check_preconditions(
+    request: Request,
+    etag: str | None = None,
+    last_modified: datetime | None = None
+) -> None:
+    """This function sets the validators of a response, and stops the route early if the client's copy is still fresh"""
+    request.state.validators = (etag, last_modified)
+
+    if is_not_modified(request, etag, last_modified):
+        raise NotModified()
+
+@functools.lru_cache(maxsize=None)
+def response_adapter(response_model: Any) -> TypeAdapter:
+    return TypeAdapter(response_model)
+
+def render_response_model(request: Request, content: Any) -> Response:
+    if isinstance(content, Response):
+        # Already rendered, e.g. by `validated_response`
+        return content
+
+    route = request.scope.get('route')
+
+    if (response_model := getattr(route, 'response_model', None)) is None:
+        return ORJSONResponse(content)
+
+    # Validate & filter the content like FastAPI would, since the route returns a response itself
+    adapter = response_adapter(response_model)
+    content = adapter.validate_python(content, from_attributes=True)
+    return Response(adapter.dump_json(content), media_type='application/json')
+
+def conditional(func: typing.Callable) -> typing.Callable:
+    """This function adds ETag & Last-Modified headers to a route, and answers conditional requests with 304.
+    The body is rendered through the route's `response_model` to hash it, unless the route is also `validated_response`."""
+    def not_modified(request: Request) -> Response:
+        etag, last_modified = request.state.validators
+        return Response(status_code=304, headers=validator_headers(etag, last_modified))
+
+    def finalize(request: Request, content: Any) -> Response:
+        response = render_response_model(request, content)
+
+        if response.status_code != 200:
+            return response
+
+        etag, last_modified = getattr(request.state, 'validators', (None, None))
+
+        if etag is None and hasattr(response, 'body'):
+            # Fall back to a hash of the rendered body
+            etag = f'"{hashlib.blake2b(response.body, digest_size=16).hexdigest()}"'
+            request.state.validators = (etag, last_modified)
+
+        if is_not_modified(request, etag, last_modified):
+            return not_modified(request)
+
+        response.headers.update(validator_headers(etag, last_modified))
+        return response
+
+    @functools.wraps(func)
+    async def async_wrapper(*args, **kwargs):
+        request = resolve_request(func, *args, **kwargs)
+
+        try:
+            content = await func(*args, **kwargs)
+        except NotModified:
+            return not_modified(request)
+
+        return finalize(request, content)
+
+    @functools.wraps(func)
+    def sync_wrapper(*args, **kwargs):
+        request = resolve_request(func, *args, **kwargs)
+
+        try:
+            content = func(*args, **kwargs)
+        except NotModified:
+            return not_modified(request)
+
+        return finalize(request, content)
+
+    if asyncio.iscoroutinefunction(func):
+        return async_wrapper
+    else:
+        return sync_wrapper
+
+def fetch_permissions(request: Request) -> Tuple[List[str], List[str]]:
+    """Resolve the granted & rejected permissions of the user, once per request"""
+    if (cached := getattr(request.state, 'permissions', None)) is not None:
+        return cached
+
+    request.state.permissions = permissions.fetch_all(request.user.id)
+    request.state.permission_fetches = getattr(request.state, 'permission_fetches', 0) + 1
+    return request.state.permissions
+
+async def fetch_permissions_async(request: Request) -> Tuple[List[str], List[str]]:
+    if (cached := getattr(request.state, 'permissions', None)) is not None:
+        return cached
+
+    return await run_async(fetch_permissions, request)
+
+def is_rejected(permission: str, rejected: List[str]) -> bool:
+    permission = permission.lower().removesuffix('.*')
+    return permissions.includes_permission(permission, rejected)
+
+def has_permission(permission: str, request: Request) -> bool:
+    """Check if the user has been granted a permission, using the request's permission sets"""
+    if not request.user.is_authenticated:
+        return False
+
+    granted, rejected = fetch_permissions(request)
+
+    if is_rejected(permission, rejected):
+        return False
+
+    return permissions.includes_permission(permission, granted)
+
 def requires(
     scopes: str | typing.Sequence[str],
     status_code: int = 403,
@@ -108,10 +378,6 @@ def requires(
 ) -> typing.Callable[[typing.Callable], typing.Callable]:
     """This function checks if the user is either an admin, or has the required scope(s)"""
     scopes_list = [scopes] if isinstance(scopes, str) else list(scopes)
-    
-    def is_rejected(permission: str, rejected: List[str]) -> bool:
-        permission = permission.lower().removesuffix('.*')
-        return permissions.includes_permission(permission, rejected)
 
     def decorator(func: typing.Callable) -> typing.Callable:
         @functools.wraps(func)
@@ -128,7 +394,7 @@ def requires(
                 if request.user.is_admin:
                     return await func(*args, **kwargs)
 
-                granted, rejected = await run_async(permissions.fetch_all, request.user.id)
+                granted, rejected = await fetch_permissions_async(request)
 
                 if any(is_rejected(scope, rejected) for scope in scopes_list):
                     raise HTTPException(status_code, detail=message)
@@ -149,7 +415,7 @@ def requires(
                 if request.user.is_admin:
                     return func(*args, **kwargs)
 
-                granted, rejected = permissions.fetch_all(request.user.id)
+                granted, rejected = fetch_permissions(request)
 
                 if any(is_rejected(scope, rejected) for scope in scopes_list):
                     raise HTTPException(status_code, detail=message)
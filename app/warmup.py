@@ -0,0 +1,81 @@
+
+from app.executors import executors
+from app.session import config
+from app import session, cache
+
+from fastapi import FastAPI
+from typing import Callable
+from sqlalchemy import text
+
+import logging
+import asyncio
+import time
+
+logger = logging.getLogger('warmup')
+
+async def warmup(api: FastAPI) -> None:
+    """Prepare connections & caches, so that the first requests of a new worker don't pay for them"""
+    started_at = time.perf_counter()
+
+    await run_stage('database connections', warm_database_connections)
+    await run_stage('redis connections', warm_redis_connections)
+    await run_stage('reference data', warm_reference_data)
+    await run_stage('openapi schema', api.openapi)
+
+    logger.info(f'Warm-up finished in {(time.perf_counter() - started_at) * 1000:.1f}ms')
+
+async def run_stage(name: str, stage: Callable) -> None:
+    started_at = time.perf_counter()
+
+    try:
+        if asyncio.iscoroutinefunction(stage):
+            await stage()
+        else:
+            # Blocking stages run in the threadpool, to keep the event loop free
+            await executors['io'].run(stage)
+    except Exception as e:
+        # A failed warm-up only makes the first requests slower
+        logger.warning(f'Failed to warm up {name}: {e}', exc_info=e)
+        return
+
+    logger.debug(f'Warmed up {name} in {(time.perf_counter() - started_at) * 1000:.1f}ms')
+
+def warm_database_connections() -> None:
+    amount = min(config.API_WARMUP_CONNECTIONS, config.POSTGRES_POOL_SIZE)
+    connections = []
+
+    try:
+        # Checking out several connections at once forces the pool to open them
+        for _ in range(amount):
+            connection = session.database.engine.connect()
+            connections.append(connection)
+            connection.execute(text('SELECT 1'))
+    finally:
+        # Returning the connections keeps them open inside the pool
+        for connection in connections:
+            connection.close()
+
+def warm_sync_redis_connections() -> None:
+    pool = session.redis.connection_pool
+    connections = []
+
+    try:
+        for _ in range(config.API_WARMUP_CONNECTIONS):
+            connections.append(pool.get_connection())
+    finally:
+        for connection in connections:
+            pool.release(connection)
+
+async def warm_redis_connections() -> None:
+    await executors['io'].run(warm_sync_redis_connections)
+
+    # Concurrent commands force the pool to open multiple connections
+    await asyncio.gather(*(
+        session.redis_async.ping()
+        for _ in range(config.API_WARMUP_CONNECTIONS)
+    ))
+
+def warm_reference_data() -> None:
+    # Loads the datasets into the cache that the listing routes read from
+    with session.database.managed_session() as db:
+        cache.reference.preload(db)
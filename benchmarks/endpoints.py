@@ -0,0 +1,352 @@
+"""
+Hermetic benchmark for the hot api endpoints.
+
+Boots `app:api` in-process against local stand-ins, seeds a realistic
+dataset and drives each endpoint at a fixed concurrency. The latency
+percentiles (p50/p95/p99), throughput and status codes of every endpoint
+are written to a json file, which can be compared against a previous run.
+
+Usage:
+    python -m benchmarks.endpoints [--fake-redis] [--create-schema] [--seed]
+                                   [--concurrency 16] [--duration 10]
+                                   [--output results.json] [--compare baseline.json]
+
+Requirements:
+    - httpx, and fakeredis[lua] when passing `--fake-redis`
+    - a throwaway postgres database, configured through the usual
+      POSTGRES_* environment variables (e.g. `docker run -e POSTGRES_PASSWORD=... postgres`)
+
+Storage is forced into the local filesystem mode (S3_ENABLED=False) and
+ratelimiting is disabled, so that it doesn't skew the results.
+"""
+
+from typing import Any, Callable, Dict, List, Tuple
+from collections import Counter
+from datetime import datetime
+
+import subprocess
+import statistics
+import argparse
+import asyncio
+import zipfile
+import random
+import json
+import time
+import sys
+import io
+import os
+
+# Realistic-ish dataset sizes, can be scaled with `--scale`
+USERS = 1000
+BEATMAPSETS = 200
+SCORES_PER_BEATMAP = 50
+TOPIC_POSTS = 100
+
+COUNTRIES = ('DE', 'US', 'JP', 'GB', 'PL', 'FR', 'KR', 'BR')
+
+def configure_environment(args: argparse.Namespace) -> None:
+    # These need to be set before the app gets imported
+    os.environ['API_RATELIMIT_ENABLED'] = 'False'
+    os.environ['S3_ENABLED'] = 'False'
+    os.environ.setdefault('API_RESPONSE_CACHE', str(args.response_cache))
+    os.environ.setdefault('API_REQUEST_COALESCING', str(args.coalescing))
+
+    if args.fake_redis:
+        install_fake_redis()
+
+def install_fake_redis() -> None:
+    """Replace the redis clients with fakeredis, sharing one in-memory server"""
+    import fakeredis
+    import redis.asyncio
+    import redis
+
+    server = fakeredis.FakeServer()
+
+    class FakeRedis(fakeredis.FakeRedis):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, server=server, **kwargs)
+
+    class FakeRedisAsync(fakeredis.FakeAsyncRedis):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, server=server, **kwargs)
+
+    redis.Redis = FakeRedis
+    redis.asyncio.Redis = FakeRedisAsync
+
+def user_fixture(user_id: int) -> dict:
+    return {
+        'id': user_id, 'name': f'Player {user_id}', 'safe_name': f'player_{user_id}',
+        'email': f'player{user_id}@example.com', 'bcrypt': '', 'country': COUNTRIES[user_id % len(COUNTRIES)],
+        'created_at': datetime(2008, 1, 1), 'latest_activity': datetime(2008, 6, 1),
+        'restricted': False, 'activated': True, 'preferred_mode': 0, 'playstyle': 0
+    }
+
+def stats_fixture(user_id: int, mode: int, rank: int) -> dict:
+    return {
+        'id': user_id, 'mode': mode, 'rank': rank, 'tscore': 50_000_000 - rank,
+        'rscore': 20_000_000 - rank, 'pp': 5000 - rank * 2.5, 'ppv1': 3000 - rank * 1.5,
+        'playcount': 2500, 'playtime': 360000, 'acc': 0.97, 'max_combo': 1200,
+        'total_hits': 500000, 'replay_views': 10, 'xh_count': 5, 'x_count': 20,
+        'sh_count': 30, 's_count': 150, 'a_count': 400, 'b_count': 200,
+        'c_count': 100, 'd_count': 50
+    }
+
+def osz_fixture(set_id: int) -> bytes:
+    buffer = io.BytesIO()
+
+    with zipfile.ZipFile(buffer, 'w') as osz:
+        osz.writestr(f'Artist - Title ({set_id}).osu', 'osu file format v7\n' * 2000)
+        osz.writestr('audio.mp3', os.urandom(512 * 1024))
+
+    return buffer.getvalue()
+
+def seed(scale: float) -> dict:
+    """Insert the benchmark dataset & return the ids to request"""
+    from app.common.database.objects import (
+        DBUser, DBStats, DBBeatmapset, DBBeatmap, DBScore,
+        DBForum, DBForumTopic, DBForumPost
+    )
+    from benchmarks.serialization import beatmapset_fixture, beatmap_fixture, score_fixture
+    import app.session
+
+    user_ids = list(range(1, int(USERS * scale) + 1))
+    set_ids = list(range(1, int(BEATMAPSETS * scale) + 1))
+    scores_per_beatmap = min(int(SCORES_PER_BEATMAP * scale), len(user_ids))
+    score_id = 1
+
+    with app.session.database.managed_session() as session:
+        for user_id in user_ids:
+            session.add(DBUser(**user_fixture(user_id)))
+            session.add(DBStats(**stats_fixture(user_id, 0, user_id)))
+
+        session.flush()
+
+        for set_id in set_ids:
+            beatmapset = beatmapset_fixture(set_id)
+            beatmapset['creator_id'] = user_ids[set_id % len(user_ids)]
+            session.add(DBBeatmapset(**beatmapset))
+
+            beatmap = beatmap_fixture(set_id)
+            beatmap.pop('beatmapset')
+            beatmap.update(set_id=set_id, md5=f'{set_id:032x}')
+            session.add(DBBeatmap(**beatmap))
+
+            for user_id in random.sample(user_ids, scores_per_beatmap):
+                score = score_fixture(score_id)
+                score.pop('beatmap')
+                score.update(user_id=user_id, beatmap_id=set_id, total_score=random.randint(1, 10_000_000))
+                session.add(DBScore(**score))
+                score_id += 1
+
+        session.flush()
+
+        session.add(DBForum(
+            id=1, name='Benchmarks', description='Benchmark forum',
+            created_at=datetime(2008, 1, 1), topic_count=1,
+            post_count=int(TOPIC_POSTS * scale)
+        ))
+        session.add(DBForumTopic(
+            id=1, forum_id=1, creator_id=user_ids[0], title='Benchmark topic',
+            views=0, post_count=int(TOPIC_POSTS * scale), announcement=False, pinned=False,
+            created_at=datetime(2008, 1, 1), last_post_at=datetime(2008, 1, 1)
+        ))
+        session.flush()
+
+        for post_id in range(1, int(TOPIC_POSTS * scale) + 1):
+            session.add(DBForumPost(
+                id=post_id, topic_id=1, forum_id=1,
+                user_id=user_ids[post_id % len(user_ids)],
+                content='[b]Benchmark[/b] post content ' * 20,
+                created_at=datetime(2008, 1, 1), edit_time=datetime(2008, 1, 1),
+                edit_count=0, edit_locked=False, deleted=False
+            ))
+
+    with app.session.redis.pipeline() as pipe:
+        for user_id in user_ids:
+            country = COUNTRIES[user_id % len(COUNTRIES)].lower()
+
+            for order in ('performance', 'rscore', 'tscore', 'ppv1'):
+                pipe.zadd(f'bancho:{order}:0', {user_id: 10_000_000 - user_id})
+                pipe.zadd(f'bancho:{order}:0:{country}', {user_id: 10_000_000 - user_id})
+
+        pipe.set('bancho:totalusers', len(user_ids))
+        pipe.set('bancho:totalscores', score_id - 1)
+        pipe.set('bancho:totalbeatmaps', len(set_ids))
+        pipe.set('bancho:totalbeatmapsets', len(set_ids))
+        pipe.execute()
+
+    for set_id in set_ids[:10]:
+        app.session.storage.upload_osz(set_id, osz_fixture(set_id))
+
+    return resolve_dataset(scale)
+
+def resolve_dataset(scale: float) -> dict:
+    user_ids = list(range(1, int(USERS * scale) + 1))
+    set_ids = list(range(1, int(BEATMAPSETS * scale) + 1))
+    return {'users': user_ids, 'beatmapsets': set_ids, 'osz': set_ids[:10]}
+
+def create_schema() -> None:
+    from app.common.database.objects import Base
+    import app.session
+
+    Base.metadata.create_all(app.session.database.engine)
+
+def resolve_token() -> str:
+    from app.common.database.repositories import users
+    import app.security
+    import app.session
+
+    with app.session.database.managed_session() as session:
+        user = users.fetch_by_id(1, session=session)
+        return app.security.generate_token(user, int(time.time()) + 3600)
+
+def scenarios(dataset: dict, token: str) -> Dict[str, Callable[[], Tuple[str, str, dict]]]:
+    """Endpoint name -> function returning a (method, url, request options) tuple"""
+    users = dataset['users']
+    sets = dataset['beatmapsets']
+    osz = dataset['osz']
+
+    return {
+        'rankings': lambda: ('GET', f'/rankings/performance/osu?offset={random.choice((0, 50, 100))}', {}),
+        'rankings_around': lambda: ('GET', f'/rankings/performance/osu/around/{random.choice(users)}?radius=10', {}),
+        'beatmap_scores': lambda: ('GET', f'/beatmaps/{random.choice(sets)}/scores', {}),
+        'profile': lambda: ('GET', f'/users/{random.choice(users[:100])}', {}),
+        'search': lambda: ('POST', '/beatmapsets/search', {'json': {'page': random.randint(0, 3)}}),
+        'osz': lambda: ('GET', f'/beatmapsets/{random.choice(osz)}/osz', {'headers': {'Authorization': f'Bearer {token}'}}),
+        'forum_posts': lambda: ('GET', f'/forum/1/topics/1/posts?offset={random.choice((0, 25, 50))}', {}),
+        'stats': lambda: ('GET', '/stats', {}),
+    }
+
+async def drive(client, scenario: Callable, concurrency: int, duration: float) -> dict:
+    samples: List[int] = []
+    statuses: Counter = Counter()
+    deadline = time.perf_counter() + duration
+
+    async def worker() -> None:
+        while time.perf_counter() < deadline:
+            method, url, options = scenario()
+            start = time.perf_counter_ns()
+            response = await client.request(method, url, **options)
+            await response.aread()
+            samples.append(time.perf_counter_ns() - start)
+            statuses[response.status_code] += 1
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started_at
+    samples.sort()
+
+    return {
+        'requests': len(samples),
+        'rps': len(samples) / elapsed,
+        'p50_ms': percentile(samples, 0.50) / 1e6,
+        'p95_ms': percentile(samples, 0.95) / 1e6,
+        'p99_ms': percentile(samples, 0.99) / 1e6,
+        'mean_ms': statistics.fmean(samples) / 1e6 if samples else 0.0,
+        'statuses': {str(status): count for status, count in statuses.items()}
+    }
+
+def percentile(samples: List[int], fraction: float) -> float:
+    if not samples:
+        return 0.0
+
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results: dict, baseline_path: str) -> None:
+    with open(baseline_path) as f:
+        baseline = json.load(f)['results']
+
+    print(f'\n{"endpoint":<16} {"p50":>9} {"p99":>9} {"req/s":>9}  (vs. {baseline_path})')
+
+    for name, result in results.items():
+        if not (previous := baseline.get(name)):
+            continue
+
+        def change(key: str) -> str:
+            if not previous[key]:
+                return 'n/a'
+
+            return f'{(result[key] - previous[key]) / previous[key] * 100:+.1f}%'
+
+        print(f'{name:<16} {change("p50_ms"):>9} {change("p99_ms"):>9} {change("rps"):>9}')
+
+async def run(args: argparse.Namespace) -> dict:
+    from httpx import AsyncClient, ASGITransport
+    from app import api
+
+    if args.create_schema:
+        create_schema()
+
+    dataset = seed(args.scale) if args.seed else resolve_dataset(args.scale)
+    selected = scenarios(dataset, resolve_token())
+
+    if args.endpoints:
+        selected = {name: selected[name] for name in args.endpoints}
+
+    results: Dict[str, Any] = {}
+
+    async with api.router.lifespan_context(api):
+        transport = ASGITransport(app=api, client=('127.0.0.1', 50000))
+
+        async with AsyncClient(transport=transport, base_url='http://benchmark') as client:
+            for name, scenario in selected.items():
+                # Warm up caches & connections before measuring
+                await drive(client, scenario, args.concurrency, min(1.0, args.duration))
+                results[name] = await drive(client, scenario, args.concurrency, args.duration)
+
+                result = results[name]
+                print(
+                    f'{name:<16} '
+                    f'p50={result["p50_ms"]:7.2f}ms '
+                    f'p95={result["p95_ms"]:7.2f}ms '
+                    f'p99={result["p99_ms"]:7.2f}ms '
+                    f'{result["rps"]:8.1f} req/s '
+                    f'statuses={result["statuses"]}'
+                )
+
+    return results
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Endpoint benchmark suite')
+    parser.add_argument('--fake-redis', action='store_true')
+    parser.add_argument('--create-schema', action='store_true')
+    parser.add_argument('--seed', action='store_true')
+    parser.add_argument('--scale', default=1.0, type=float)
+    parser.add_argument('--concurrency', default=16, type=int)
+    parser.add_argument('--duration', default=10.0, type=float)
+    parser.add_argument('--endpoints', nargs='*')
+    parser.add_argument('--response-cache', action='store_true')
+    parser.add_argument('--coalescing', action='store_true')
+    parser.add_argument('--output', default='benchmark-results.json')
+    parser.add_argument('--compare')
+    args = parser.parse_args()
+
+    configure_environment(args)
+    results = asyncio.run(run(args))
+
+    with open(args.output, 'w') as f:
+        json.dump({
+            'timestamp': datetime.now().isoformat(),
+            'revision': git_revision(),
+            'python': sys.version.split()[0],
+            'concurrency': args.concurrency,
+            'duration': args.duration,
+            'scale': args.scale,
+            'response_cache': args.response_cache,
+            'coalescing': args.coalescing,
+            'results': results
+        }, f, indent=2)
+
+    print(f'\nResults written to {args.output}')
+
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Reports the import cost of the application, to keep worker spawns cheap.
+
+Runs `import app` in a fresh interpreter with `-X importtime`, then lists
+the most expensive modules & top-level packages together with the total
+import time and peak RSS of the process.
+
+Usage:
+    python -m benchmarks.imports [--module app] [--limit 25] [--check]
+
+Passing `--check` exits with a non-zero status, when the cold-start
+budget below is exceeded.
+"""
+
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+import subprocess
+import argparse
+import sys
+
+# Cold-start budget of a single worker, see the README
+IMPORT_BUDGET_MS = 1500
+RSS_BUDGET_MB = 160
+
+# Prints the peak RSS of the interpreter in kilobytes, after the import has finished
+MEASURE_SCRIPT = """
+import resource, sys
+import {module}
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, file=sys.stdout)
+"""
+
+def measure(module: str) -> Tuple[List[Tuple[str, int, int]], int]:
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', MEASURE_SCRIPT.format(module=module)],
+        capture_output=True,
+        text=True
+    )
+
+    if process.returncode != 0:
+        sys.stderr.write(process.stderr)
+        raise SystemExit(process.returncode)
+
+    entries = []
+
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+
+        # Format: "import time: <self> | <cumulative> | <indented module name>"
+        self_us, cumulative_us, name = line.removeprefix('import time:').split('|')
+        entries.append((name.strip(), int(self_us), int(cumulative_us)))
+
+    return entries, int(process.stdout.strip().splitlines()[-1])
+
+def group_by_package(entries: List[Tuple[str, int, int]]) -> Dict[str, int]:
+    packages = defaultdict(int)
+
+    for name, self_us, _ in entries:
+        packages[name.split('.')[0]] += self_us
+
+    return packages
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Import time profiler')
+    parser.add_argument('--module', default='app')
+    parser.add_argument('--limit', default=25, type=int)
+    parser.add_argument('--check', action='store_true')
+    args = parser.parse_args()
+
+    entries, rss_kb = measure(args.module)
+    total_ms = sum(self_us for _, self_us, _ in entries) / 1e3
+    rss_mb = rss_kb / 1024
+
+    print(f'{"cumulative":>12} {"self":>10}  module')
+
+    for name, self_us, cumulative_us in sorted(entries, key=lambda entry: -entry[2])[:args.limit]:
+        print(f'{cumulative_us / 1e3:10.1f}ms {self_us / 1e3:8.1f}ms  {name}')
+
+    print(f'\n{"self":>12}  package')
+
+    for package, self_us in sorted(group_by_package(entries).items(), key=lambda item: -item[1])[:args.limit]:
+        print(f'{self_us / 1e3:10.1f}ms  {package}')
+
+    print(
+        f'\ntotal import time: {total_ms:.1f}ms (budget {IMPORT_BUDGET_MS}ms), '
+        f'peak rss: {rss_mb:.1f}MB (budget {RSS_BUDGET_MB}MB)'
+    )
+
+    if args.check and (total_ms > IMPORT_BUDGET_MS or rss_mb > RSS_BUDGET_MB):
+        raise SystemExit('Cold-start budget exceeded')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Microbenchmark for the ratelimit counter, comparing the previous
+multi-roundtrip implementation with the atomic lua script.
+
+Usage:
+    python -m benchmarks.ratelimit [--host 127.0.0.1] [--port 6379] [--fake]
+
+Passing `--fake` runs against fakeredis (requires `fakeredis[lua]`)
+instead of a local redis-server.
+"""
+
+from redis.asyncio import Redis
+from typing import Callable, Tuple
+
+from app.middleware.ratelimiting import RATELIMIT_SCRIPT
+
+import statistics
+import argparse
+import asyncio
+import time
+
+WINDOW = 60
+
+async def legacy_increment(redis: Redis, key: str, window: int) -> Tuple[int, int]:
+    ttl_key = f'{key}:ttl'
+    current = await redis.incr(key)
+    current_time = int(time.time())
+
+    if current == 1:
+        await redis.expire(key, window)
+        await redis.setex(ttl_key, window, current_time + window)
+
+    reset_time = int(await redis.get(ttl_key) or b'0')
+
+    if not reset_time:
+        reset_time = current_time + window
+        await redis.setex(ttl_key, window, reset_time)
+
+    return current, reset_time
+
+def script_increment(redis: Redis) -> Callable:
+    script = redis.register_script(RATELIMIT_SCRIPT)
+
+    async def increment(redis: Redis, key: str, window: int) -> Tuple[int, int]:
+        current, ttl = await script(keys=[key], args=[window, 1], client=redis)
+        return int(current), int(time.time()) + int(ttl)
+
+    return increment
+
+async def run(name: str, func: Callable, redis: Redis, iterations: int, keys: int) -> None:
+    samples = []
+
+    for index in range(iterations):
+        key = f'benchmark:ratelimit:{name}:{index % keys}'
+        start = time.perf_counter_ns()
+        await func(redis, key, WINDOW)
+        samples.append(time.perf_counter_ns() - start)
+
+    samples.sort()
+    print(
+        f'{name:<8} '
+        f'mean={statistics.fmean(samples) / 1e3:8.1f}us '
+        f'p50={samples[len(samples) // 2] / 1e3:8.1f}us '
+        f'p99={samples[int(len(samples) * 0.99)] / 1e3:8.1f}us'
+    )
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description='Ratelimit counter microbenchmark')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', default=6379, type=int)
+    parser.add_argument('--iterations', default=20000, type=int)
+    parser.add_argument('--keys', default=100, type=int)
+    parser.add_argument('--fake', action='store_true')
+    args = parser.parse_args()
+
+    if args.fake:
+        from fakeredis.aioredis import FakeRedis
+        redis = FakeRedis()
+    else:
+        redis = Redis(host=args.host, port=args.port)
+
+    try:
+        await run('legacy', legacy_increment, redis, args.iterations, args.keys)
+        await run('script', script_increment(redis), redis, args.iterations, args.keys)
+    finally:
+        async for key in redis.scan_iter('benchmark:ratelimit:*'):
+            await redis.delete(key)
+
+        await redis.aclose()
+
+if __name__ == '__main__':
+    asyncio.run(main())
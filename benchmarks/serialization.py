@@ -0,0 +1,89 @@
+"""
+Benchmark for the response serialization of a 50-score `ScoreCollectionResponse`.
+
+Usage:
+    python -m benchmarks.serialization [--iterations 2000]
+"""
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from datetime import datetime
+from typing import Callable
+
+from app.responses import ORJSONResponse
+from app.models import ScoreCollectionResponse
+
+import argparse
+import timeit
+
+def beatmapset_fixture(set_id: int) -> dict:
+    return {
+        'id': set_id, 'title': 'Title', 'artist': 'Artist', 'creator': 'Creator',
+        'source': '', 'tags': 'some tags here', 'creator_id': 2, 'topic_id': 1,
+        'status': 1, 'has_video': False, 'has_storyboard': True, 'offset': 0,
+        'server': 0, 'download_server': 0, 'available': True, 'enhanced': False,
+        'explicit': False, 'language_id': 2, 'genre_id': 3,
+        'display_title': '[bold:0,size:20]Artist|[]Title',
+        'created_at': datetime(2008, 1, 1), 'last_update': datetime(2008, 2, 1),
+        'approved_at': datetime(2008, 3, 1), 'approved_by': 1,
+        'rating_average': 9.2, 'rating_count': 120, 'favourite_count': 40,
+        'total_playcount': 52000, 'max_diff': 4.8, 'osz_filesize': 4_000_000,
+        'osz_filesize_novideo': 3_000_000
+    }
+
+def beatmap_fixture(beatmap_id: int) -> dict:
+    return {
+        'id': beatmap_id, 'set_id': 1, 'mode': 0, 'md5': 'a' * 32, 'status': 1,
+        'version': 'Insane', 'filename': 'Artist - Title (Creator) [Insane].osu',
+        'created_at': datetime(2008, 1, 1), 'last_update': datetime(2008, 2, 1),
+        'playcount': 25000, 'passcount': 8000, 'total_length': 120,
+        'drain_length': 110, 'max_combo': 800, 'bpm': 180.0, 'cs': 4.0,
+        'ar': 8.0, 'od': 7.0, 'hp': 6.0, 'diff': 4.8, 'count_normal': 400,
+        'count_slider': 200, 'count_spinner': 2, 'slider_multiplier': 1.4,
+        'beatmapset': beatmapset_fixture(1)
+    }
+
+def score_fixture(score_id: int) -> dict:
+    return {
+        'id': score_id, 'user_id': score_id, 'beatmap_id': 1,
+        'submitted_at': datetime(2008, 5, 1), 'mode': 0, 'status_pp': 3,
+        'status_score': 3, 'client_version': 20080501,
+        'client_string': 'b20080501', 'pp': 120.5, 'ppv1': 80.2, 'acc': 0.97,
+        'total_score': 4_500_000, 'max_combo': 780, 'mods': 0, 'perfect': False,
+        'passed': True, 'pinned': False, 'n300': 580, 'n100': 12, 'n50': 1,
+        'nMiss': 1, 'nGeki': 100, 'nKatu': 8, 'grade': 'A', 'replay_views': 4,
+        'failtime': None, 'beatmap': beatmap_fixture(1)
+    }
+
+def benchmark(name: str, func: Callable, iterations: int) -> None:
+    elapsed = timeit.timeit(func, number=iterations)
+    print(f'{name:<28} {elapsed / iterations * 1e6:9.1f}us per response')
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Response serialization benchmark')
+    parser.add_argument('--iterations', default=2000, type=int)
+    args = parser.parse_args()
+
+    response = ScoreCollectionResponse.model_validate({
+        'total': 50,
+        'scores': [score_fixture(index) for index in range(50)]
+    })
+
+    benchmark(
+        'jsonable_encoder + json',
+        lambda: JSONResponse(jsonable_encoder(response)),
+        args.iterations
+    )
+    benchmark(
+        'model_dump + orjson',
+        lambda: ORJSONResponse(response.model_dump(mode='json')),
+        args.iterations
+    )
+    benchmark(
+        'direct model serialization',
+        lambda: ORJSONResponse(response),
+        args.iterations
+    )
+
+if __name__ == '__main__':
+    main()
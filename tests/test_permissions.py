@@ -0,0 +1,64 @@
+
+from types import SimpleNamespace
+
+from app.utils import requires, has_permission
+from app import utils
+
+import pytest
+
+@pytest.fixture
+def fetches(monkeypatch):
+    calls = []
+
+    def fetch_all(user_id: int):
+        calls.append(user_id)
+        return ['forum.topics.*'], ['forum.topics.edit_icon']
+
+    monkeypatch.setattr(utils.permissions, 'fetch_all', fetch_all)
+    return calls
+
+def make_request() -> SimpleNamespace:
+    return SimpleNamespace(
+        state=SimpleNamespace(),
+        user=SimpleNamespace(id=1, is_authenticated=True, is_admin=False),
+        auth=SimpleNamespace(scopes=['forum.topics.create'])
+    )
+
+@requires("forum.topics.create")
+def create_topic(request) -> dict:
+    # Same permission checks as `routes.forum.topics.create_topic`
+    return {
+        'can_force_change_icon': has_permission("forum.moderation.topics.edit_icon", request),
+        'can_change_icon': has_permission("forum.topics.edit_icon", request),
+        'can_set_options': has_permission("forum.moderation.topics.set_options", request),
+        'can_create': has_permission("forum.topics.create", request)
+    }
+
+def test_permissions_are_fetched_once_per_request(fetches):
+    request = make_request()
+
+    assert create_topic(request) == {
+        'can_force_change_icon': False,
+        'can_change_icon': False,
+        'can_set_options': False,
+        'can_create': True
+    }
+    assert fetches == [1]
+    assert request.state.permission_fetches == 1
+
+def test_permissions_of_the_authentication_are_reused(fetches):
+    request = make_request()
+
+    # Set by the authentication middleware, after resolving the user's scopes
+    request.state.permissions = (['forum.topics.*'], [])
+    request.state.permission_fetches = 1
+
+    assert create_topic(request)['can_change_icon']
+    assert fetches == []
+    assert request.state.permission_fetches == 1
+
+def test_permissions_are_fetched_again_for_a_new_request(fetches):
+    create_topic(make_request())
+    create_topic(make_request())
+
+    assert fetches == [1, 1]